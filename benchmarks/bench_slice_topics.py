@@ -0,0 +1,53 @@
+# benchmarks/bench_slice_topics.py
+
+"""
+Compares ClipOpsModel.slice_topics modes on a synthetic video.
+
+    python benchmarks/bench_slice_topics.py --duration 1800 --topics 30
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clipops.model import ClipOpsModel  # noqa: E402
+from synthetic import make_video, topic_list  # noqa: E402
+
+MODES = ("per_topic", "seek", "single_pass")
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--duration", type=int, default=600, help="Synthetic video length in seconds")
+    p.add_argument("--topics", type=int, default=20)
+    p.add_argument("--modes", default=",".join(MODES))
+    args = p.parse_args()
+
+    work = tempfile.mkdtemp(prefix="clipops_bench_")
+    try:
+        video = os.path.join(work, "source.mp4")
+        print(f"🎬 Generating {args.duration}s synthetic video...")
+        make_video(video, args.duration)
+
+        model = ClipOpsModel()
+        topics = topic_list(args.duration, args.topics)
+        quiet = lambda msg: None
+
+        print(f"{'mode':<12} {'seconds':>8}")
+        for mode in args.modes.split(","):
+            shutil.rmtree(os.path.join(work, "Topics_source"), ignore_errors=True)
+            t0 = time.perf_counter()
+            ok = model.slice_topics(video, topics, quiet, mode=mode)
+            elapsed = time.perf_counter() - t0
+            print(f"{mode:<12} {elapsed:>8.2f}{'' if ok else '  (FAILED)'}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
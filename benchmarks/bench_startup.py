@@ -0,0 +1,68 @@
+# benchmarks/bench_startup.py
+
+"""
+Cold-start budget check: times `import <module>` in fresh interpreters.
+
+    python benchmarks/bench_startup.py --module clipops.controller --runs 5
+
+Exits with status 1 when the median exceeds STARTUP_BUDGET_MS (or --budget),
+so it can gate CI; the slowest imports are printed to show what regressed.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clipops.config import STARTUP_BUDGET_MS  # noqa: E402
+from clipops.startup import import_breakdown  # noqa: E402
+
+# Must stay out of the start-up path; they are imported lazily or pre-warmed
+HEAVY = ("whisper", "torch", "deep_translator", "numpy")
+
+
+def cold_import(module):
+    code = f"import sys; import {module}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(f"❌ import {module} failed:\n{proc.stderr.strip()}")
+    return elapsed, [m for m in proc.stdout.strip().split(",") if m]
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--module", default="clipops.controller")
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="Median budget in ms")
+    args = p.parse_args()
+
+    times, heavy = [], []
+    for _ in range(args.runs):
+        elapsed, heavy = cold_import(args.module)
+        times.append(elapsed)
+    median = statistics.median(times)
+
+    print(f"import {args.module}: median {median:.0f} ms over {args.runs} run(s) (budget {args.budget:.0f} ms)")
+    failed = False
+    if heavy:
+        print(f"❌ Heavy modules loaded at start-up: {', '.join(heavy)}")
+        failed = True
+    if median > args.budget:
+        print("❌ Over budget. Slowest imports:")
+        for cumulative, own, name in import_breakdown(args.module, top=10):
+            print(f"{cumulative:8.1f} ms {own:8.1f} ms  {name}")
+        failed = True
+    if not failed:
+        print("✅ Within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+# benchmarks/bench_suite.py
+
+"""
+Benchmarks every ClipOpsModel operation on synthetic media.
+
+    python benchmarks/bench_suite.py --duration 600 --segments 2000 --out base.json
+    python benchmarks/bench_suite.py --out new.json
+    python benchmarks/bench_suite.py --compare base.json new.json --threshold 0.15
+
+Each operation runs in a fresh worker process (cold caches unless --warm) with
+stub Whisper and translation backends, so only ClipOps' own work is timed.
+Wall time, peak RSS (worker and its ffmpeg children) and the number of
+subprocesses spawned are written to JSON; --compare exits 1 on regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import make_video, make_transcript, topic_list  # noqa: E402
+
+OPERATIONS = ("transcribe", "whatsapp", "whatsapp_copy", "whatsapp_balanced", "detect_topics", "topics",
+              "topics_seek", "topics_smart", "manual_cut", "preview", "translate", "vtt", "subtitles")
+MIN_DELTA = {"wall": 0.05, "peak_rss_mb": 5.0, "subprocesses": 0}  # Ignore noise below these absolute changes
+
+
+# --- Stubs ---
+class StubWhisper:
+    """Stands in for a Whisper model: one segment per 4 s of audio, no inference."""
+
+    def transcribe(self, audio, language=None, **kwargs):
+        seconds = len(audio) / 16000
+        segments = [{"start": t, "end": min(seconds, t + 3.6), "text": f" stub segment {int(t)}"}
+                    for t in range(0, int(seconds), 4)]
+        return {"segments": segments, "language": language or "en"}
+
+
+class StubTranslator:
+    name = "stub"
+    source, target = "auto", "xx"
+
+    def translate_batch(self, lines):
+        return [line[::-1] for line in lines]
+
+
+# --- Worker (one operation per process) ---
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None, None  # Windows
+    to_mb = 1 / (1024 * 1024) if sys.platform == "darwin" else 1 / 1024  # ru_maxrss: bytes on macOS, KiB elsewhere
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * to_mb
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * to_mb
+    return round(own, 1), round(children, 1)
+
+
+def run_worker(op, work, video, transcript, duration):
+    spawned = [0]
+    original_init = subprocess.Popen.__init__
+
+    def counting_init(self, *args, **kwargs):
+        spawned[0] += 1
+        original_init(self, *args, **kwargs)
+
+    subprocess.Popen.__init__ = counting_init
+
+    from clipops.model import ClipOpsModel
+    from clipops.registry import registry
+    from clipops.translation_memory import TranslationMemory
+
+    registry.loader = lambda name, device, dtype: StubWhisper()
+    model = ClipOpsModel()
+    log = lambda msg: None
+    topics = topic_list(duration, 10)
+    t0 = time.perf_counter()
+
+    if op == "transcribe":
+        ok = model.transcribe_video(video, log, long_form=False, resume=False)
+    elif op == "whatsapp":
+        ok = model.slice_whatsapp(video, log)
+    elif op == "whatsapp_copy":
+        ok = model.slice_whatsapp(video, log, profile="archive-copy")
+    elif op == "whatsapp_balanced":
+        ok = model.slice_whatsapp(video, log, profile="whatsapp-balanced")
+    elif op == "detect_topics":
+        ok = model.detect_topics(video, log)
+    elif op == "topics":
+        ok = model.slice_topics(video, topics, log, mode="single_pass")
+    elif op == "topics_seek":
+        ok = model.slice_topics(video, topics, log, mode="seek")
+    elif op == "topics_smart":
+        ok = model.slice_topics(video, topics, log, mode="smart")
+    elif op == "manual_cut":
+        ok = model.manual_cut(video, f"{duration * 0.3:.3f}", f"{duration * 0.6:.3f}", log)
+    elif op == "preview":
+        ok = model.build_preview(video, log)
+    elif op == "translate":
+        memory = TranslationMemory(os.path.join(os.environ["CLIPOPS_CACHE_DIR"], "tm.sqlite3"))  # Cold unless --warm
+        ok = model.translate_text(transcript, "xx", log, None, backend=StubTranslator(), memory=memory)
+    elif op == "vtt":
+        ok = model.convert_to_vtt(transcript, log, None)
+    elif op == "subtitles":
+        ok = model.export_subtitles(transcript, ["vtt", "srt", "ass", "json"], log, None)
+    else:
+        raise SystemExit(f"Unknown operation: {op}")
+
+    wall = time.perf_counter() - t0
+    own, children = _peak_rss_mb()
+    print(json.dumps({"ok": bool(ok), "wall": round(wall, 4), "peak_rss_mb": own,
+                      "children_peak_rss_mb": children, "subprocesses": spawned[0]}))
+
+
+# --- Runner ---
+def run_suite(args):
+    work = tempfile.mkdtemp(prefix="clipops_suite_")
+    try:
+        video = os.path.join(work, "source.mp4")
+        transcript = os.path.join(work, "transcript.txt")
+        print(f"🎬 Generating {args.duration}s synthetic video and {args.segments}-segment transcript...")
+        make_video(video, args.duration)
+        make_transcript(transcript, args.segments)
+
+        results = {}
+        ops = [o.strip() for o in args.ops.split(",") if o.strip()]
+        print(f"{'operation':<15} {'wall s':>8} {'rss MB':>8} {'child MB':>9} {'procs':>6}")
+        for op in ops:
+            runs = []
+            for r in range(args.repeat):
+                env = dict(os.environ)
+                env["CLIPOPS_CACHE_DIR"] = os.path.join(work, "cache" if args.warm else f"cache_{op}_{r}")
+                proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", op, "--work", work,
+                                       "--duration", str(args.duration)], capture_output=True, text=True, env=env)
+                lines = proc.stdout.strip().splitlines()
+                if proc.returncode != 0 or not lines:
+                    runs.append({"ok": False, "error": proc.stderr.strip()[-500:]})
+                    break
+                runs.append(json.loads(lines[-1]))
+
+            ok = all(r.get("ok") for r in runs)
+            walls = [r["wall"] for r in runs if "wall" in r]
+            result = {"ok": ok, "runs": runs}
+            if walls:
+                result.update(
+                    wall=round(statistics.median(walls), 4),
+                    peak_rss_mb=max((r["peak_rss_mb"] or 0) for r in runs if "wall" in r),
+                    children_peak_rss_mb=max((r["children_peak_rss_mb"] or 0) for r in runs if "wall" in r),
+                    subprocesses=max(r["subprocesses"] for r in runs if "wall" in r),
+                )
+                print(f"{op:<15} {result['wall']:>8.2f} {result['peak_rss_mb']:>8.1f} "
+                      f"{result['children_peak_rss_mb']:>9.1f} {result['subprocesses']:>6}{'' if ok else '  (FAILED)'}")
+            else:
+                print(f"{op:<15} FAILED: {runs[-1].get('error', '')[:200]}")
+            results[op] = result
+
+        report = {
+            "meta": {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                     "platform": platform.platform(), "cpu_count": os.cpu_count(), "duration": args.duration,
+                     "segments": args.segments, "repeat": args.repeat, "warm": args.warm},
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Results: {args.out}")
+        return 0 if all(r["ok"] for r in results.values()) else 1
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def compare(base_path, new_path, threshold):
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = json.load(f)["results"]
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'operation':<15} {'metric':<13} {'base':>9} {'new':>9} {'change':>8}")
+    for op in sorted(set(base) & set(new)):
+        if base[op].get("ok") and not new[op].get("ok"):
+            print(f"{op:<15} {'status':<13} {'ok':>9} {'FAILED':>9}   ❌")
+            regressions += 1
+            continue
+        for metric, floor in MIN_DELTA.items():
+            old, cur = base[op].get(metric), new[op].get(metric)
+            if old is None or cur is None:
+                continue
+            change = (cur - old) / old if old else (float("inf") if cur > old else 0.0)
+            flag = cur - old > floor and change > threshold
+            regressions += flag
+            print(f"{op:<15} {metric:<13} {old:>9.2f} {cur:>9.2f} {change:>+7.0%}{'   ❌' if flag else ''}")
+    for op in sorted(set(base) ^ set(new)):
+        print(f"{op:<15} only in {'base' if op in base else 'new'}")
+
+    print(f"{'❌' if regressions else '✅'} {regressions} regression(s) above {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--duration", type=int, default=300, help="Synthetic video length in seconds")
+    p.add_argument("--segments", type=int, default=2000, help="Synthetic transcript length")
+    p.add_argument("--ops", default=",".join(OPERATIONS))
+    p.add_argument("--repeat", type=int, default=3, help="Runs per operation (median wall time is reported)")
+    p.add_argument("--warm", action="store_true", help="Share caches between runs instead of starting cold")
+    p.add_argument("--out", default="bench_results.json")
+    p.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two result files")
+    p.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown flagged as a regression")
+    p.add_argument("--worker", help=argparse.SUPPRESS)
+    p.add_argument("--work", help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.worker:
+        return run_worker(args.worker, args.work, os.path.join(args.work, "source.mp4"),
+                          os.path.join(args.work, "transcript.txt"), args.duration)
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+    return run_suite(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# benchmarks/synthetic.py
+
+"""Synthetic inputs shared by the benchmark scripts (ffmpeg lavfi sources, fake transcripts)."""
+
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clipops.transcript import Transcript  # noqa: E402
+
+WORDS = ("packet", "router", "layer", "network", "socket", "frame", "header", "switch", "address", "protocol")
+
+
+def make_video(path, duration, size="640x360", rate=25, gop=50):
+    """testsrc video + sine audio, H.264/AAC, a keyframe every `gop` frames."""
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc=size={size}:rate={rate}:duration={duration}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", str(gop), "-c:a", "aac", "-shortest", path,
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def fmt(seconds):
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+def topic_list(duration, count):
+    step = duration / count
+    return "\n".join(f"{fmt(i * step)} - {fmt((i + 1) * step)} : Topic_{i + 1}" for i in range(count))
+
+
+def segment_text(n, words=8):
+    return " ".join(WORDS[(n * 7 + i * 3) % len(WORDS)] for i in range(words))
+
+
+def make_transcript(path, segments, seconds_per_segment=4.0):
+    """Writes `path` (.txt) and its JSONL sidecar with `segments` evenly spaced segments."""
+    transcript = Transcript(language="en")
+    for n in range(segments):
+        start = n * seconds_per_segment
+        transcript.append(start, start + seconds_per_segment * 0.9, segment_text(n))
+    transcript.write_txt(path)
+    transcript.save(path)
+    return path
@@ -0,0 +1,10 @@
+# clipops/__main__.py
+
+import sys
+from .batch import main
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["watch"]:
+        from .watcher import main as watch_main
+        sys.exit(watch_main(sys.argv[2:]))
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# clipops/audio_cache.py
+
+import hashlib
+import os
+import threading
+import numpy as np
+from .config import AUDIO_CACHE_DIR, AUDIO_CACHE_QUOTA_MB, SAMPLE_RATE
+from .tracing import span
+from .utils import run_ffmpeg_command, file_fingerprint
+
+
+class AudioCache:
+    """
+    Content-addressed cache of decoded PCM (raw float32, little-endian).
+    Entries are keyed by the source's content fingerprint plus decode parameters,
+    so re-transcribing with another model or language never decodes again.
+    Readers get a read-only numpy.memmap (zero-copy). Total size is capped by a
+    disk quota; least recently used entries are deleted first.
+    """
+
+    def __init__(self, root=AUDIO_CACHE_DIR, quota_bytes=AUDIO_CACHE_QUOTA_MB * 1024 * 1024):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def key(self, video_path, sample_rate=SAMPLE_RATE, channels=1):
+        fp = file_fingerprint(video_path)
+        return hashlib.sha1(f"{fp['hash']}|{sample_rate}|{channels}|f32le".encode()).hexdigest()
+
+    def path(self, video_path, log_callback, sample_rate=SAMPLE_RATE, channels=1):
+        """Returns the cached PCM file for `video_path`, decoding it on a miss."""
+        key = self.key(video_path, sample_rate, channels)
+        target = os.path.join(self.root, f"{key}.f32")
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if os.path.exists(target):
+                os.utime(target)  # LRU: mtime doubles as "last used"
+                log_callback("🔊 Audio cache hit")
+                return target
+
+            os.makedirs(self.root, exist_ok=True)
+            tmp = f"{target}.{os.getpid()}.part"
+            log_callback("🔊 Decoding audio (cached for next time)...")
+            cmd = ["ffmpeg", "-y", "-i", video_path, "-map", "0:a:0", "-vn", "-ac", str(channels),
+                   "-ar", str(sample_rate), "-f", "f32le", "-acodec", "pcm_f32le", tmp]
+            with span("audio.decode", "audio"):
+                ok = run_ffmpeg_command(cmd, log_callback)
+            if not ok:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise RuntimeError("Audio extraction failed")
+            os.replace(tmp, target)
+
+        self.evict(keep=target)
+        return target
+
+    def open(self, video_path, log_callback, sample_rate=SAMPLE_RATE, channels=1):
+        """Read-only memmap of the decoded audio (shape: samples, or samples x channels)."""
+        audio = np.memmap(self.path(video_path, log_callback, sample_rate, channels), dtype=np.float32, mode="r")
+        return audio.reshape(-1, channels) if channels > 1 else audio
+
+    def evict(self, keep=None):
+        """Deletes least recently used entries until the cache fits its quota."""
+        if not os.path.isdir(self.root):
+            return
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".f32"):
+                p = os.path.join(self.root, name)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.quota_bytes:
+                break
+            if p == keep:
+                continue
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass  # Still mapped by a reader (Windows); try again next time
+
+
+# Shared by transcription and audio analysis
+audio_cache = AudioCache()
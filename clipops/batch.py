@@ -0,0 +1,198 @@
+# clipops/batch.py
+
+"""
+Headless batch runner: applies a list of operations to many videos.
+Imports neither customtkinter nor tkinter so it can run on servers.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .model import ClipOpsModel
+
+OPERATIONS = ("transcribe", "whatsapp", "detect_topics", "topics", "translate", "vtt", "subtitles", "preview")
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov")
+DEFAULT_MANIFEST = "clipops_manifest.jsonl"
+
+
+def transcript_path(video_path):
+    """Path of the transcript that transcribe_video writes for a video."""
+    return f"{os.path.splitext(video_path)[0]}_transcript.txt"
+
+
+def collect_inputs(patterns, extensions=VIDEO_EXTENSIONS):
+    """Expands directories and glob patterns into a sorted, de-duplicated file list."""
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, names in os.walk(pattern):
+                for name in names:
+                    if name.lower().endswith(extensions):
+                        files.add(os.path.abspath(os.path.join(root, name)))
+        else:
+            for path in glob.glob(pattern, recursive=True):
+                if os.path.isfile(path):
+                    files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+class JobQueue:
+    """
+    Runs (file, operation) jobs with bounded concurrency.
+    Every state change is appended to a JSONL manifest; on restart, jobs whose
+    last record is 'done' are skipped so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, manifest_path=DEFAULT_MANIFEST, concurrency=1, model=None, log=print):
+        self.manifest_path = manifest_path
+        self.concurrency = max(1, concurrency)
+        self.model = model or ClipOpsModel()
+        self._print = log
+        self._lock = threading.Lock()
+        self.done = self._load_done()
+
+    # --- Manifest ---
+    def _load_done(self):
+        last = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # Half-written line from a killed run
+                    last[(rec.get("file"), rec.get("op"))] = rec.get("status")
+        return {key for key, status in last.items() if status == "done"}
+
+    def _record(self, **rec):
+        rec["ts"] = round(time.time(), 3)
+        with self._lock:
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    def _log(self, msg):
+        with self._lock:
+            self._print(msg)
+
+    # --- Execution ---
+    def run(self, files, ops, options=None):
+        """Processes every file; operations on one file run in order. Returns the failure count."""
+        options = options or {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(lambda f: self.run_file(f, ops, options), files))
+        return sum(results)
+
+    def run_file(self, video_path, ops, options):
+        """Runs `ops` on one file in order, stopping at the first failure. Returns the failure count."""
+        failures = 0
+        name = os.path.basename(video_path)
+        for op in ops:
+            if (video_path, op) in self.done:
+                self._log(f"⏭️ [{name}] {op}: already done")
+                continue
+
+            self._record(file=video_path, op=op, status="running")
+            t0 = time.perf_counter()
+            try:
+                ok = self._dispatch(op, video_path, options, lambda m: self._log(f"[{name}] {m}"))
+                error = None
+            except Exception as e:
+                ok, error = False, str(e)
+            duration = round(time.perf_counter() - t0, 3)
+
+            self._record(file=video_path, op=op, status="done" if ok else "failed",
+                         duration=duration, exit_code=0 if ok else 1, error=error)
+            if ok:
+                self.done.add((video_path, op))
+            else:
+                failures += 1
+                self._log(f"❌ [{name}] {op} failed; skipping remaining operations for this file")
+                break
+        return failures
+
+    def _dispatch(self, op, video_path, options, log):
+        m = self.model
+        if op == "transcribe":
+            return m.transcribe_video(video_path, log)
+        if op == "whatsapp":
+            return m.slice_whatsapp(video_path, log)
+        if op == "detect_topics":
+            return m.detect_topics(video_path, log)
+        if op == "preview":
+            return m.build_preview(video_path, log)
+        if op == "topics":
+            topics_file = options.get("topics") or f"{os.path.splitext(video_path)[0]}_topics.txt"
+            if not os.path.exists(topics_file):
+                log(f"⚠️ Topics file not found: {topics_file}")
+                return False
+            with open(topics_file, "r", encoding="utf-8") as f:
+                return m.slice_topics(video_path, f.read(), log)
+        if op == "translate":
+            return m.translate_text(transcript_path(video_path), options.get("lang", "en"), log, None)
+        if op == "vtt":
+            return m.convert_to_vtt(transcript_path(video_path), log, None)
+        if op == "subtitles":
+            return m.export_subtitles(transcript_path(video_path), options.get("formats", ["vtt"]), log, None)
+        raise ValueError(f"Unknown operation: {op}")
+
+
+# --- CLI ---
+def add_job_arguments(p):
+    """Options shared by the batch runner and the folder watcher."""
+    p.add_argument("--ops", default="transcribe",
+                   help=f"Comma-separated operations, run in order per file ({', '.join(OPERATIONS)})")
+    p.add_argument("-j", "--jobs", type=int, default=1, help="Files processed concurrently")
+    p.add_argument("--lang", default="en", help="Target language for 'translate'")
+    p.add_argument("--formats", default="vtt,srt", help="Formats for 'subtitles' (vtt, srt, ass, json)")
+    p.add_argument("--topics", help="Topic list for 'topics' (default: <video>_topics.txt)")
+    p.add_argument("--manifest", default=DEFAULT_MANIFEST, help="JSONL manifest used for status and resume")
+
+
+def parse_ops(value):
+    """'transcribe, translate' -> ['transcribe', 'translate']; prints an error and returns None if any is unknown."""
+    ops = [o.strip() for o in value.split(",") if o.strip()]
+    unknown = [o for o in ops if o not in OPERATIONS]
+    if unknown:
+        print(f"❌ Unknown operation(s): {', '.join(unknown)}", file=sys.stderr)
+        return None
+    return ops
+
+
+def job_options(args):
+    return {"lang": args.lang, "topics": args.topics,
+            "formats": [f.strip() for f in args.formats.split(",") if f.strip()]}
+
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="python -m clipops", description="ClipOps headless batch processor.",
+                                epilog="Watch a folder instead: python -m clipops watch FOLDER --ops ...")
+    p.add_argument("inputs", nargs="+", help="Video files, directories or glob patterns")
+    add_job_arguments(p)
+    p.add_argument("--fresh", action="store_true", help="Ignore the existing manifest and redo all work")
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    ops = parse_ops(args.ops)
+    if ops is None:
+        return 2
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("⚠️ No input files found.", file=sys.stderr)
+        return 2
+
+    if args.fresh and os.path.exists(args.manifest):
+        os.remove(args.manifest)
+
+    queue = JobQueue(args.manifest, concurrency=args.jobs)
+    print(f"🚀 {len(files)} file(s) x {len(ops)} operation(s), {args.jobs} at a time")
+    failures = queue.run(files, ops, job_options(args))
+    print(f"🏁 Finished with {failures} failure(s). Manifest: {args.manifest}")
+    return 1 if failures else 0
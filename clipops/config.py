@@ -1,8 +1,105 @@
 # clipops/config.py
 
+import os
+
 APP_NAME = "ClipOps"
 APP_VERSION = "v2.0.0 (MVC)"
 COMPANY_NAME = "COLLEXA"
 THEME_COLOR = "dark-blue"
 ACCENT_COLOR = "#FF5722"  # Deep Orange
-ICON_FILE = "clipops.ico"
\ No newline at end of file
+ICON_FILE = "clipops.ico"
+
+# --- Whisper Model Cache ---
+WHISPER_MODEL = "base"
+WHISPER_DEVICE = None        # None = let Whisper pick (cuda if available)
+WHISPER_DTYPE = "float32"    # "float16" only helps on GPU
+MODEL_CACHE_SIZE = 2         # Max models kept loaded at once (LRU)
+MODEL_MEMORY_BUDGET_MB = 0   # 0 = no memory budget, count limit only
+MODEL_IDLE_TIMEOUT = 600     # Seconds before an unused model is unloaded
+
+# --- Topic Slicing ---
+TOPIC_SLICE_MODE = "single_pass"   # "single_pass" | "seek" | "smart" | "per_topic"
+TOPIC_OUTPUTS_PER_PASS = 40        # Keeps the ffmpeg command line under OS limits
+
+# --- FFmpeg Worker Pool ---
+CPU_COUNT = os.cpu_count() or 2
+FFMPEG_COPY_WORKERS = min(4, CPU_COUNT)          # Stream copies are I/O-bound
+FFMPEG_ENCODE_WORKERS = max(1, CPU_COUNT // 4)   # Each x264 encode already uses several threads
+
+# --- FFmpeg Runner ---
+FFMPEG_LOG_LINES = 50   # stderr lines kept per process (ring buffer)
+
+# --- Caches & Smart Cut ---
+CACHE_DIR = os.environ.get("CLIPOPS_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".clipops", "cache")
+SMART_CUT = True                                      # Frame-accurate manual cuts
+SMART_CUT_ENCODERS = {"h264": "libx264", "hevc": "libx265"}
+SMART_CUT_PRESET = "veryfast"
+SMART_CUT_CRF = 18                                    # Edges only; visually lossless
+
+# --- Translation ---
+TRANSLATE_BATCH_CHARS = 4500   # Google rejects requests over 5000 characters
+TRANSLATE_WORKERS = 4          # Concurrent requests
+TRANSLATE_RETRIES = 3
+TRANSLATE_BACKOFF = 1.0        # Seconds; doubles on every retry
+TM_PATH = os.path.join(CACHE_DIR, "translation_memory.sqlite3")
+TM_MAX_ENTRIES = 200_000       # Least recently used entries are evicted past this
+
+# --- Transcription ---
+TRANSCRIBE_WORD_TIMESTAMPS = False   # Word timings enable finer subtitle splitting (slower)
+SAMPLE_RATE = 16000                  # Whisper's input rate
+TRANSCRIBE_CHUNK_SECONDS = 5 * 60    # Checkpoint granularity; also bounds per-worker memory
+TRANSCRIBE_SEARCH_SECONDS = 30       # How far from the target a silence may be picked
+LONGFORM_MIN_DURATION = 20 * 60      # Videos longer than this are transcribed by parallel workers
+LONGFORM_WORKERS = max(1, CPU_COUNT // 4)   # Each worker loads its own model
+
+# --- Subtitles ---
+SUBTITLE_FORMATS = ["vtt", "srt", "ass", "json"]
+SUBTITLE_MAX_CHARS = 84        # Two 42-char lines; longer cues are split
+SUBTITLE_MAX_DURATION = 7.0    # Seconds per cue before splitting
+
+# --- Audio Cache ---
+AUDIO_CACHE_DIR = os.path.join(CACHE_DIR, "audio")
+AUDIO_CACHE_QUOTA_MB = 20 * 1024     # Decoded PCM is ~230 MB per hour at 16 kHz float32
+
+# --- Task Manager / UI ---
+TASK_WORKERS = 2       # Operations that may run at the same time
+TASK_HISTORY = 20      # Finished tasks kept in the task list
+UI_TICK_MS = 100       # One coalesced UI refresh per tick
+
+# --- Start-up ---
+PREWARM_DELAY_MS = 1500   # Background imports start this long after the window appears
+PREWARM_MODULES = ("numpy", "clipops.longform", "clipops.translation", "clipops.translation_memory",
+                   "whisper", "deep_translator")
+PREWARM_WHISPER = False   # Also load WHISPER_MODEL into the registry (uses RAM/VRAM up front)
+STARTUP_BUDGET_MS = 1500  # benchmarks/bench_startup.py fails above this
+
+# --- Encode Profiles (see profiles.PROFILES) ---
+WHATSAPP_PROFILE = "whatsapp-16MB"   # "archive-copy" restores plain 3-minute stream copies;
+                                     # "whatsapp-balanced" copies N equal parts at keyframes
+SLICE_CONCURRENT = False             # Balanced profiles: cut every part at once instead of one segment pass
+
+# --- Automatic Topic Segmentation ---
+SEGMENT_FPS = 2                    # Analysis bins per second (frames sampled for scene scoring)
+SEGMENT_TARGET_SECONDS = 300       # Preferred chapter length
+SEGMENT_SEARCH_SECONDS = 90        # How far a cut may move from the target to find a better point
+SEGMENT_MIN_SECONDS = 60           # Shortest chapter
+SEGMENT_WEIGHTS = (0.35, 0.40, 0.25)  # Scene change, silence, transcript gap
+
+# --- Output Cache ---
+OUTPUT_CACHE = True   # Skip operations whose inputs, parameters and outputs are unchanged
+
+# --- Preview (proxy, thumbnail sprite, waveform) ---
+PREVIEW_HEIGHT = 240               # Proxy video height
+PREVIEW_CRF = 32
+PREVIEW_THUMB_SIZE = (160, 90)     # One sprite tile
+PREVIEW_THUMB_INTERVAL = 10        # Seconds between thumbnails (raised for long videos, see PREVIEW_MAX_THUMBS)
+PREVIEW_MAX_THUMBS = 600
+PREVIEW_SPRITE_COLUMNS = 10
+PREVIEW_PEAKS_PER_SECOND = 20      # Waveform resolution
+PREVIEW_SNAP_WINDOW = 2.0          # Seconds a cut may move when snapping to a keyframe or silence
+
+# --- Watch Folder (python -m clipops watch) ---
+WATCH_INTERVAL = 2.0                   # Seconds between folder scans
+WATCH_STABLE_SECONDS = 10.0            # Size and mtime must stay unchanged this long before a file is processed
+WATCH_STATUS_FILE = "clipops_watch_status.json"   # Written into the watched folder unless --status is given
+WATCH_SEEN_FILE = ".clipops_watch_seen.jsonl"     # Content hashes already processed (survives restarts)
@@ -1,25 +1,44 @@
 # clipops/controller.py
 
-import threading
+import os
 from tkinter import filedialog
+from .config import UI_TICK_MS, PREWARM_DELAY_MS, PREWARM_MODULES, PREWARM_WHISPER, WHISPER_MODEL
 from .model import ClipOpsModel
+from .startup import prewarm
+from .tasks import TaskManager, DONE, CANCELLED
 from .view import ClipOpsView
 
 class ClipOpsController:
     """
     Connects the View and Model.
     Handles Threading and Event Binding.
+    Operations run as tasks on the TaskManager; a single periodic tick moves
+    their buffered logs and progress into the widgets.
     """
 
     def __init__(self):
         self.model = ClipOpsModel()
         self.view = ClipOpsView()
-        
-        self._bind_events()
+        self.tasks = TaskManager()
+        self._busy = None  # None (idle), "determinate" or "indeterminate"
+        self._on_done = {}  # task id -> callback(state), run on the UI thread
 
-    def run(self):
+        self._bind_events()
+        self.view.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def run(self, on_ready=None):
+        """on_ready (optional) is called once the window has been drawn."""
+        self.view.after(UI_TICK_MS, self._tick)
+        if on_ready:
+            self.view.after_idle(on_ready)
+        self.view.after(PREWARM_DELAY_MS, lambda: prewarm(PREWARM_MODULES, self.tasks.log,
+                                                          WHISPER_MODEL if PREWARM_WHISPER else None))
         self.view.mainloop()
 
+    def _on_close(self):
+        self.tasks.shutdown()
+        self.view.destroy()
+
     def _bind_events(self):
         # File Browsing
         self.view.btn_browse_video.configure(command=self._browse_video)
@@ -31,21 +50,58 @@ class ClipOpsController:
         self.view.btn_translate.configure(command=self._start_translate)
         self.view.btn_vtt.configure(command=self._start_vtt)
         self.view.btn_topic_slice.configure(command=self._start_topic_slice)
+        self.view.btn_detect_topics.configure(command=self._start_detect_topics)
         self.view.btn_manual_cut.configure(command=self._start_manual_cut)
+        self.view.btn_build_preview.configure(command=self._start_preview)
 
     # --- UI Helpers ---
     def _log(self, msg):
-        # Schedule update on main thread
-        self.view.after(0, lambda: self.view.log_message(msg))
-
-    def _progress(self, val):
-        self.view.after(0, lambda: self.view.update_progress_val(val))
+        # Main thread only (worker logs go through the TaskManager buffer)
+        self.view.log_message(msg)
+
+    def _tick(self):
+        logs = self.tasks.drain_logs()
+        if logs:
+            self.view.log_messages(logs)
+
+        snapshot = self.tasks.snapshot()
+        self.view.update_tasks(snapshot, self.tasks.cancel)
+        self._update_status(snapshot)
+
+        for t in self.tasks.drain_finished():
+            callback = self._on_done.pop(t["id"], None)
+            if callback:
+                callback(t["state"])
+            if t["state"] != CANCELLED:
+                ok = t["state"] == DONE
+                self.view.show_alert("Task Status", f"{t['name']}: " + ("Operation Completed!" if ok else "Operation Failed!"), not ok)
+
+        self.view.after(UI_TICK_MS, self._tick)
+
+    def _update_status(self, snapshot):
+        active = [t for t in snapshot if t["state"] in ("queued", "running")]
+        if not active:
+            if self._busy:
+                last = max(snapshot, key=lambda t: t["id"])
+                self.view.set_loading(False, message="Done" if last["state"] == DONE else last["state"].capitalize())
+                self._busy = None
+            return
+
+        tracked = [t["progress"] for t in active if t["progress"] is not None]
+        mode = "determinate" if tracked else "indeterminate"
+        if mode != self._busy:
+            self.view.set_loading(True, determinate=bool(tracked))
+            self._busy = mode
+        if tracked:
+            self.view.update_progress_val(sum(tracked) / len(tracked))
+        self.view.lbl_status.configure(text=f"Processing... ({len(active)} task{'s' if len(active) > 1 else ''})")
 
     def _browse_video(self):
         fn = filedialog.askopenfilename(filetypes=[("Video", "*.mp4 *.mkv *.avi")])
         if fn:
             self.view.set_video_path(fn)
             self._log(f"Video Loaded: {fn}")
+            self.view.set_preview(self.model.load_preview(fn))
 
     def _browse_text(self):
         fn = filedialog.askopenfilename(filetypes=[("Text", "*.txt")])
@@ -53,51 +109,67 @@ class ClipOpsController:
             self.view.set_text_path(fn)
             self._log(f"Transcript Loaded: {fn}")
 
-    # --- Threading Managers ---
-    def _run_threaded(self, target, *args, determinate=False):
-        self.view.set_loading(True, determinate=determinate)
-        
-        def wrapper():
-            if determinate:
-                success = target(*args, log_callback=self._log, progress_callback=self._progress)
-            else:
-                success = target(*args, log_callback=self._log)
-            
-            self.view.after(0, lambda: self.view.set_loading(False, message="Done" if success else "Failed"))
-            self.view.after(0, lambda: self.view.show_alert("Task Status", "Operation Completed!" if success else "Operation Failed!", not success))
-
-        threading.Thread(target=wrapper, daemon=True).start()
+    # --- Task Submission ---
+    def _run_task(self, name, target, *args, determinate=False, on_done=None):
+        task = self.tasks.submit(name, target, *args, determinate=determinate)
+        if on_done:
+            self._on_done[task.id] = on_done
+        self._log(f"🗂️ Task #{task.id} queued: {name}")
 
     # --- Operation Handlers ---
     def _start_transcribe(self):
         path = self.view.get_video_path()
         if not path: return self.view.show_alert("Error", "No video selected!", True)
-        self._run_threaded(self.model.transcribe_video, path)
+        self._run_task(f"Transcribe {os.path.basename(path)}", self.model.transcribe_video, path)
 
     def _start_whatsapp(self):
         path = self.view.get_video_path()
         if not path: return self.view.show_alert("Error", "No video selected!", True)
-        self._run_threaded(self.model.slice_whatsapp, path)
+        self._run_task(f"WhatsApp {os.path.basename(path)}", self.model.slice_whatsapp, path, determinate=True)
 
     def _start_translate(self):
         path = self.view.get_text_path()
         if not path: return self.view.show_alert("Error", "No text file selected!", True)
         lang = self.view.get_lang()
-        self._run_threaded(self.model.translate_text, path, lang, determinate=True)
+        self._run_task(f"Translate → {lang}", self.model.translate_text, path, lang, determinate=True)
 
     def _start_vtt(self):
         path = self.view.get_text_path()
         if not path: return self.view.show_alert("Error", "No text file selected!", True)
-        self._run_threaded(self.model.convert_to_vtt, path, determinate=True)
+        self._run_task("Subtitles", self.model.export_subtitles, path, self.view.get_sub_formats(), determinate=True)
 
     def _start_topic_slice(self):
         path = self.view.get_video_path()
         text = self.view.get_topics_text()
         if not path: return self.view.show_alert("Error", "No video selected!", True)
-        self._run_threaded(self.model.slice_topics, path, text)
+        self._run_task(f"Topics {os.path.basename(path)}", self.model.slice_topics, path, text, determinate=True)
+
+    def _start_detect_topics(self):
+        path = self.view.get_video_path()
+        if not path: return self.view.show_alert("Error", "No video selected!", True)
+        topics_file = f"{os.path.splitext(path)[0]}_topics.txt"
+
+        def load(state):
+            if state == DONE and os.path.exists(topics_file):
+                with open(topics_file, "r", encoding="utf-8") as f:
+                    self.view.set_topics_text(f.read())
+
+        self._run_task(f"Detect topics {os.path.basename(path)}", self.model.detect_topics, path,
+                       determinate=True, on_done=load)
+
+    def _start_preview(self):
+        path = self.view.get_video_path()
+        if not path: return self.view.show_alert("Error", "No video selected!", True)
+
+        def show(state):
+            if state == DONE:
+                self.view.set_preview(self.model.load_preview(path))
+
+        self._run_task(f"Preview {os.path.basename(path)}", self.model.build_preview, path,
+                       determinate=True, on_done=show)
 
     def _start_manual_cut(self):
         path = self.view.get_video_path()
         s, e = self.view.get_manual_times()
         if not path: return self.view.show_alert("Error", "No video selected!", True)
-        self._run_threaded(self.model.manual_cut, path, s, e)
\ No newline at end of file
+        self._run_task(f"Cut {s}-{e}", self.model.manual_cut, path, s, e, determinate=True)
\ No newline at end of file
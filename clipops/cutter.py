@@ -0,0 +1,91 @@
+# clipops/cutter.py
+
+import os
+import shutil
+import tempfile
+from .config import SMART_CUT_ENCODERS, SMART_CUT_PRESET, SMART_CUT_CRF
+from .media_index import get_media_index
+from .utils import run_ffmpeg_command
+from .workers import ffmpeg_pool
+
+
+def _encode_args(video):
+    encoder = SMART_CUT_ENCODERS.get(video.get("codec_name"), "libx264")
+    args = ["-c:v", encoder, "-preset", SMART_CUT_PRESET, "-crf", str(SMART_CUT_CRF)]
+    if video.get("pix_fmt"):
+        args += ["-pix_fmt", video["pix_fmt"]]
+    return args
+
+
+def _timescale_args(video):
+    # Matching the source timescale keeps copied and re-encoded pieces concat-compatible
+    tb = video.get("time_base") or ""
+    den = tb.split("/")[-1] if "/" in tb else ""
+    return ["-video_track_timescale", den] if den.isdigit() else []
+
+
+def _piece(video_path, start, duration, out, codec_args):
+    return ["ffmpeg", "-y", "-ss", f"{start:.6f}", "-i", video_path, "-t", f"{duration:.6f}",
+            "-map", "0:v:0", "-an", "-sn", "-dn"] + codec_args + [out]
+
+
+def smart_cut(video_path, start, end, output, log_callback, progress_callback=None, index=None):
+    """
+    Frame-accurate cut that avoids a full re-encode.
+    The keyframe-aligned middle of [start, end) is stream-copied; only the partial
+    GOPs before the first and after the last keyframe are re-encoded. Pieces are
+    joined with the concat demuxer and muxed with the (re-encoded) audio of the range.
+    """
+    index = index or get_media_index(video_path, log_callback)
+    video = index.video_stream
+    end = min(end, index.duration) if index.duration else end
+    if video is None or end <= start:
+        log_callback("❌ Smart cut needs a video stream and start < end.")
+        return False
+
+    k_in = index.keyframe_at_or_after(start)
+    k_out = index.keyframe_at_or_before(end)
+    encode = _encode_args(video)
+    audio = ["-c:a", "aac", "-b:a", "192k"] if index.has_audio else ["-an"]
+
+    if k_in is None or k_out is None or k_out <= k_in:
+        # No full GOP inside the range: re-encoding all of it is the cheapest accurate option
+        log_callback("🎯 Short range, re-encoding whole clip for accuracy...")
+        cmd = ["ffmpeg", "-y", "-ss", f"{start:.6f}", "-i", video_path, "-t", f"{end - start:.6f}",
+               "-map", "0:v:0", "-map", "0:a?"] + encode + audio + ["-movflags", "+faststart", output]
+        return run_ffmpeg_command(cmd, log_callback, progress_callback=progress_callback)
+
+    work = tempfile.mkdtemp(prefix=".smartcut_", dir=os.path.dirname(os.path.abspath(output)))
+    try:
+        timescale = _timescale_args(video)
+        pieces, cmds = [], []
+        if k_in - start > 1e-3:
+            pieces.append(os.path.join(work, "head.mp4"))
+            cmds.append(_piece(video_path, start, k_in - start, pieces[-1], encode + timescale))
+        pieces.append(os.path.join(work, "middle.mp4"))
+        cmds.append(_piece(video_path, k_in, k_out - k_in, pieces[-1], ["-c", "copy"] + timescale))
+        if end - k_out > 1e-3:
+            pieces.append(os.path.join(work, "tail.mp4"))
+            cmds.append(_piece(video_path, k_out, end - k_out, pieces[-1], encode + timescale))
+
+        log_callback(f"🎯 Smart cut: copying {k_out - k_in:.2f}s, re-encoding {(k_in - start) + (end - k_out):.2f}s")
+        report = (lambda f: progress_callback(f * 0.9)) if progress_callback else None
+        if not all(ffmpeg_pool.run(cmds, lambda msg: None, progress_callback=report)):
+            log_callback("❌ Smart cut failed while preparing pieces.")
+            return False
+
+        concat_list = os.path.join(work, "list.txt")
+        with open(concat_list, "w", encoding="utf-8") as f:
+            for p in pieces:
+                escaped = p.replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+        cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list,
+               "-ss", f"{start:.6f}", "-i", video_path, "-t", f"{end - start:.6f}",
+               "-map", "0:v:0", "-map", "1:a?", "-c:v", "copy"] + audio + ["-movflags", "+faststart", output]
+        ok = run_ffmpeg_command(cmd, log_callback)
+        if ok and progress_callback:
+            progress_callback(1.0)
+        return ok
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
@@ -0,0 +1,261 @@
+# clipops/longform.py
+
+"""
+Chunked transcription: decode the audio once (via the audio cache), split it
+at silences (energy-based VAD) and transcribe the chunks either in-process or
+in a pool of worker processes. Finished chunks are checkpointed as they
+complete, so an interrupted run resumes and an edited source only
+re-transcribes the chunks whose audio changed.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from .config import (SAMPLE_RATE, TRANSCRIBE_CHUNK_SECONDS, TRANSCRIBE_SEARCH_SECONDS,
+                     WHISPER_DEVICE, WHISPER_DTYPE, CPU_COUNT, CACHE_DIR)
+from .audio_cache import audio_cache
+from .tasks import check_cancelled, current_task
+from .tracing import span
+
+_FRAME = 480  # 30 ms at 16 kHz
+
+
+def open_audio(path):
+    """Memory-maps raw float32 PCM; nothing is read until a slice is touched."""
+    return np.memmap(path, dtype=np.float32, mode="r")
+
+
+def frame_energy(audio, block_frames=20000):
+    """RMS energy per 30 ms frame, computed block by block to bound memory."""
+    n = len(audio) // _FRAME
+    energy = np.empty(n, dtype=np.float32)
+    for i in range(0, n, block_frames):
+        j = min(n, i + block_frames)
+        frames = np.asarray(audio[i * _FRAME:j * _FRAME]).reshape(-1, _FRAME)
+        energy[i:j] = np.sqrt(np.mean(frames * frames, axis=1))
+    return energy
+
+
+def find_split_points(audio, chunk_seconds=TRANSCRIBE_CHUNK_SECONDS, search_seconds=TRANSCRIBE_SEARCH_SECONDS):
+    """
+    Sample offsets that cut the audio into ~chunk_seconds pieces.
+    Each cut lands on the quietest frame within ±search_seconds of its target,
+    so chunks end in pauses instead of mid-word.
+    """
+    total = len(audio)
+    step = int(chunk_seconds * SAMPLE_RATE)
+    if total <= step * 1.25:
+        return [0, total]
+
+    energy = frame_energy(audio)
+    # Smooth over ~300 ms so a single quiet frame inside a word does not win
+    kernel = np.ones(10, dtype=np.float32) / 10
+    smooth = np.convolve(energy, kernel, mode="same")
+    window = int(search_seconds * SAMPLE_RATE) // _FRAME
+
+    points = [0]
+    target = step
+    while target < total - step // 4:
+        centre = target // _FRAME
+        lo, hi = max(points[-1] // _FRAME + 1, centre - window), min(len(smooth), centre + window)
+        cut = (lo + int(np.argmin(smooth[lo:hi]))) * _FRAME if hi > lo else target
+        points.append(cut)
+        target = cut + step
+    points.append(total)
+    return points
+
+
+def chunk_hash(audio, start, end, block=SAMPLE_RATE * 60):
+    """SHA-1 of a chunk's PCM; identical audio gives the same hash wherever it sits."""
+    h = hashlib.sha1()
+    for i in range(start, end, block):
+        h.update(np.ascontiguousarray(audio[i:min(end, i + block)]).tobytes())
+    return h.hexdigest()
+
+
+# --- Checkpoints ---
+class Checkpoint:
+    """
+    Append-only JSONL of finished chunks for one source path, model and
+    decoding options (forced language, word timestamps).
+    Segments are stored relative to their chunk and keyed by the chunk's audio
+    hash, so a chunk whose audio merely moved (re-cut source) is still reused.
+    """
+
+    def __init__(self, video_path, model_name, language=None, word_timestamps=False):
+        key = f"{os.path.abspath(video_path)}|{model_name}|{language or 'auto'}|{int(bool(word_timestamps))}"
+        key = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        self.path = os.path.join(CACHE_DIR, "checkpoints", f"{key}.jsonl")
+        self.done = {}
+        self._file = None
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        self.done[rec["hash"]] = rec
+                    except (ValueError, KeyError):
+                        continue  # Torn write from a crash
+
+    def add(self, hash_, segments, language):
+        rec = {"hash": hash_, "segments": segments, "language": language}
+        self.done[hash_] = rec
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def compact(self, keep_hashes):
+        """Rewrites the file with only the chunks of the current audio."""
+        self.close()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for h in keep_hashes:
+                if h in self.done:
+                    f.write(json.dumps(self.done[h], ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+# --- Transcribing one chunk ---
+def _run_model(model, audio, language, word_timestamps):
+    """Transcribes one chunk; timestamps are relative to the chunk start."""
+    result = model.transcribe(audio, fp16=WHISPER_DTYPE == "float16", language=language,
+                              word_timestamps=word_timestamps)
+    segments = []
+    for s in result.get("segments", []):
+        seg = {"start": s["start"], "end": s["end"], "text": s["text"]}
+        if s.get("words"):
+            seg["words"] = [[w["start"], w["end"], w["word"], w.get("probability")] for w in s["words"]]
+        segments.append(seg)
+    return segments, result.get("language")
+
+
+_worker_model = None
+
+
+def _init_worker(model_name, threads, pids):
+    global _worker_model
+    pids.put(os.getpid())  # Lets the parent kill a worker mid-chunk on cancel
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from .registry import registry
+    _worker_model = registry.get(model_name, WHISPER_DEVICE, WHISPER_DTYPE)
+
+
+def _transcribe_chunk(audio_path, start, end, language, word_timestamps):
+    audio = np.array(open_audio(audio_path)[start:end])  # Only this chunk is resident
+    return _run_model(_worker_model, audio, language, word_timestamps)
+
+
+def _shift(segments, offset):
+    """Chunk-relative segments -> Whisper-style segments on the global timeline."""
+    out = []
+    for s in segments:
+        seg = {"start": s["start"] + offset, "end": s["end"] + offset, "text": s["text"]}
+        if s.get("words"):
+            seg["words"] = [{"start": w[0] + offset, "end": w[1] + offset, "word": w[2], "probability": w[3]}
+                            for w in s["words"]]
+        out.append(seg)
+    return out
+
+
+def _terminate_pool(pool, pids):
+    """Kills the workers that reported `pids` so a cancel does not wait for the chunks they are running."""
+    while not pids.empty():
+        try:
+            os.kill(pids.get(), signal.SIGTERM)
+        except OSError:
+            pass  # Already exited
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Entry point ---
+def transcribe_chunked(video_path, model_name, log_callback, progress_callback=None, workers=1,
+                       language=None, word_timestamps=False, resume=True):
+    """
+    Returns a Whisper-style result dict with segments on the global timeline.
+    workers=1 runs in-process on the shared model registry; more uses a process pool.
+    """
+    audio_path = audio_cache.path(video_path, log_callback)
+    audio = open_audio(audio_path)
+    points = find_split_points(audio)
+    chunks = [(s, e, chunk_hash(audio, s, e)) for s, e in zip(points[:-1], points[1:])]
+    del audio  # Workers map the file themselves
+
+    checkpoint = Checkpoint(video_path, model_name, language, word_timestamps)
+    if not resume:
+        checkpoint.done.clear()
+    pending = [c for c in chunks if c[2] not in checkpoint.done]
+    reused = len(chunks) - len(pending)
+    if reused:
+        log_callback(f"♻️ Resuming: {reused}/{len(chunks)} chunks already transcribed")
+
+    workers = max(1, min(workers, len(pending) or 1))
+    if pending:
+        log_callback(f"🧩 {len(pending)} chunk(s) of ~{TRANSCRIBE_CHUNK_SECONDS // 60} min on {workers} worker(s)")
+
+    def finished(done, chunk, segments, lang):
+        checkpoint.add(chunk[2], segments, lang)
+        if progress_callback:
+            progress_callback((reused + done) / len(chunks))
+        log_callback(f"🧩 Chunk {reused + done}/{len(chunks)} done")
+
+    try:
+        if workers == 1:
+            from .registry import registry
+            with registry.acquire(model_name, WHISPER_DEVICE, WHISPER_DTYPE) as model:
+                mapped = open_audio(audio_path)
+                for done, chunk in enumerate(pending, 1):
+                    check_cancelled()
+                    with span("whisper.chunk", "whisper", seconds=(chunk[1] - chunk[0]) / SAMPLE_RATE):
+                        segments, lang = _run_model(model, np.array(mapped[chunk[0]:chunk[1]]), language,
+                                                    word_timestamps)
+                    language = language or lang  # Keep later chunks in the detected language
+                    finished(done, chunk, segments, lang)
+                del mapped
+        else:
+            threads = max(1, CPU_COUNT // workers)
+            pids = multiprocessing.SimpleQueue()
+            pool_span = span("whisper.chunks", "whisper", chunks=len(pending), workers=workers)
+            with pool_span, ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                initargs=(model_name, threads, pids)) as pool:
+                futures = {pool.submit(_transcribe_chunk, audio_path, s, e, language, word_timestamps): (s, e, h)
+                           for s, e, h in pending}
+                running, done = set(futures), 0
+                while running:
+                    # Short waits so a cancel is noticed while chunks are still being transcribed
+                    completed, running = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        done += 1
+                        segments, lang = future.result()
+                        finished(done, futures[future], segments, lang)
+                    if current_task() is not None and current_task().cancelled:
+                        _terminate_pool(pool, pids)  # Chunks finished so far are already checkpointed
+                        check_cancelled()
+    finally:
+        checkpoint.close()
+
+    checkpoint.compact([h for _, _, h in chunks])
+
+    segments, languages = [], []
+    for start, _, h in chunks:
+        rec = checkpoint.done[h]
+        segments.extend(_shift(rec["segments"], start / SAMPLE_RATE))
+        languages.append(rec.get("language"))
+    detected = max(set(languages), key=languages.count) if languages else language
+    return {"segments": segments, "language": detected}
@@ -0,0 +1,163 @@
+# clipops/media_index.py
+
+import bisect
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from .config import CACHE_DIR
+from .tracing import span, tracer
+from .utils import resolve_tool, hidden_startupinfo
+
+INDEX_VERSION = 1
+
+
+class MediaIndex:
+    """
+    Probe results for one media file: duration, streams and video keyframes.
+    keyframes[i] is a keyframe pts (seconds); keyframe_bytes[i] is the number of
+    bytes (all streams) demuxed before it, which lets callers estimate part sizes.
+    """
+
+    def __init__(self, path, duration, streams, keyframes, keyframe_bytes, total_bytes):
+        self.path = path
+        self.duration = duration
+        self.streams = streams
+        self.keyframes = keyframes
+        self.keyframe_bytes = keyframe_bytes
+        self.total_bytes = total_bytes
+
+    @property
+    def video_stream(self):
+        return next((s for s in self.streams if s.get("codec_type") == "video"), None)
+
+    @property
+    def has_audio(self):
+        return any(s.get("codec_type") == "audio" for s in self.streams)
+
+    def keyframe_at_or_after(self, t):
+        i = bisect.bisect_left(self.keyframes, t - 1e-3)
+        return self.keyframes[i] if i < len(self.keyframes) else None
+
+    def keyframe_at_or_before(self, t):
+        i = bisect.bisect_right(self.keyframes, t + 1e-3)
+        return self.keyframes[i - 1] if i else None
+
+    def is_keyframe(self, t, tolerance=1e-3):
+        k = self.keyframe_at_or_before(t)
+        return k is not None and abs(k - t) <= tolerance
+
+    def bytes_at(self, t):
+        """Approximate bytes demuxed up to time t (interpolated between keyframes)."""
+        if not self.keyframes:
+            return int(self.total_bytes * t / self.duration) if self.duration else 0
+        i = bisect.bisect_right(self.keyframes, t)
+        if i == 0:
+            return 0
+        t0, b0 = self.keyframes[i - 1], self.keyframe_bytes[i - 1]
+        t1, b1 = (self.keyframes[i], self.keyframe_bytes[i]) if i < len(self.keyframes) else (self.duration, self.total_bytes)
+        return int(b0 + (b1 - b0) * ((t - t0) / (t1 - t0) if t1 > t0 else 0))
+
+    # --- Serialization ---
+    def to_dict(self):
+        return {
+            "version": INDEX_VERSION, "path": self.path, "duration": self.duration, "streams": self.streams,
+            "keyframes": self.keyframes, "keyframe_bytes": self.keyframe_bytes, "total_bytes": self.total_bytes,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["path"], d["duration"], d["streams"], d["keyframes"], d["keyframe_bytes"], d["total_bytes"])
+
+    # --- Probing ---
+    @classmethod
+    def build(cls, path):
+        """Runs ffprobe twice: once for format/streams, once for a demux-only packet scan."""
+        ffprobe = resolve_tool("ffprobe")
+        info = json.loads(subprocess.run(
+            [ffprobe, "-v", "error", "-show_format", "-show_streams", "-of", "json", path],
+            capture_output=True, text=True, check=True, startupinfo=hidden_startupinfo()
+        ).stdout)
+
+        streams = [
+            {k: s.get(k) for k in ("index", "codec_type", "codec_name", "width", "height", "pix_fmt",
+                                   "r_frame_rate", "time_base", "sample_rate", "channels", "bit_rate")}
+            for s in info.get("streams", [])
+        ]
+        duration = float(info.get("format", {}).get("duration") or 0)
+        video = next((s["index"] for s in streams if s["codec_type"] == "video"), None)
+
+        keyframes, keyframe_bytes, total = [], [], 0
+        proc = subprocess.Popen(
+            [ffprobe, "-v", "error", "-show_entries", "packet=stream_index,pts_time,size,flags",
+             "-of", "compact=p=0", path],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, startupinfo=hidden_startupinfo()
+        )
+        for line in proc.stdout:
+            fields = dict(f.split("=", 1) for f in line.strip().split("|") if "=" in f)
+            try:
+                size = int(fields.get("size", 0))
+            except ValueError:
+                size = 0
+            if video is not None and fields.get("stream_index") == str(video) and "K" in fields.get("flags", ""):
+                try:
+                    keyframes.append(float(fields["pts_time"]))
+                    keyframe_bytes.append(total)
+                except (KeyError, ValueError):
+                    pass  # pts_time=N/A
+            total += size
+        proc.wait()
+
+        order = sorted(range(len(keyframes)), key=keyframes.__getitem__)
+        return cls(path, duration, streams, [keyframes[i] for i in order], [keyframe_bytes[i] for i in order], total)
+
+
+# --- Cache ---
+_memory = {}
+_lock = threading.Lock()
+
+
+def _cache_file(path):
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return os.path.join(CACHE_DIR, "index", hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+
+def get_media_index(path, log_callback=None, build=True):
+    """
+    Returns the MediaIndex for `path`, probing at most once per (path, size, mtime).
+    With build=False only an already-cached index is returned (else None).
+    """
+    cache_file = _cache_file(path)
+    with _lock:
+        if cache_file in _memory:
+            return _memory[cache_file]
+
+    index = None
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                index = MediaIndex.from_dict(data)
+        except (OSError, ValueError, KeyError):
+            index = None
+
+    if index is None:
+        if not build:
+            return None
+        if log_callback:
+            log_callback(f"🔎 Indexing {os.path.basename(path)} (one-time)...")
+        with span("probe.index", "probe", bytes_read=os.path.getsize(path)):
+            index = MediaIndex.build(path)
+        tracer.count("subprocesses", 2)
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f)
+        os.replace(tmp, cache_file)
+
+    with _lock:
+        _memory[cache_file] = index
+    return index
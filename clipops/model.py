@@ -1,135 +1,282 @@
 # clipops/model.py
 
 import os
-import re
-import whisper
-from deep_translator import GoogleTranslator
-from .utils import seconds_to_vtt_fmt, run_ffmpeg_command
+from .config import (WHISPER_MODEL, TOPIC_SLICE_MODE, TOPIC_OUTPUTS_PER_PASS, SMART_CUT,
+                     TRANSCRIBE_WORD_TIMESTAMPS, SUBTITLE_MAX_CHARS, SUBTITLE_MAX_DURATION,
+                     LONGFORM_MIN_DURATION, LONGFORM_WORKERS, WHATSAPP_PROFILE, SLICE_CONCURRENT, OUTPUT_CACHE,
+                     SEGMENT_FPS, SEGMENT_TARGET_SECONDS, SEGMENT_SEARCH_SECONDS, SEGMENT_MIN_SECONDS,
+                     SEGMENT_WEIGHTS)
+from .cutter import smart_cut
+from .media_index import get_media_index
+from .output_cache import OutputCache
+from .profiles import get_profile
+from .registry import registry
+from .slicer import slice_to_profile
+from .subtitles import export_subtitles
+from .timestamps import parse_topics, parse as parse_time
+from .tracing import traced
+from .transcript import Transcript, sidecar_path, split_label
+from .utils import run_ffmpeg_command, probe_duration, preview_folder
+from .workers import ffmpeg_pool
 
 class ClipOpsModel:
     """
     Handles all business logic: Transcription, Translation, Media Processing.
     """
 
-    def transcribe_video(self, video_path, log_callback):
+    def __init__(self, output_cache=OUTPUT_CACHE):
+        self._tm = None
+        self.outputs = OutputCache() if output_cache else None
+
+    def _translation_memory(self):
+        # Opened on first use; a broken or locked DB must not block translating
+        if self._tm is None:
+            from .translation_memory import TranslationMemory
+            try:
+                self._tm = TranslationMemory()
+            except Exception:
+                self._tm = False
+        return self._tm or None
+
+    # --- Output cache ---
+    def _up_to_date(self, key, op, inputs, params, log_callback):
+        if self.outputs and self.outputs.is_current(key, op, inputs, params):
+            log_callback(f"♻️ Up to date, skipped: {os.path.basename(key)}")
+            return True
+        return False
+
+    def _remember(self, key, op, inputs, params, outputs):
+        if self.outputs:
+            try:
+                self.outputs.record(key, op, inputs, params, outputs)
+            except OSError:
+                pass  # The cache is an optimisation; never fail an export over it
+
+    def _discard_outputs(self, key):
+        """Removes the files recorded for `key` by an earlier run, and its manifest."""
+        manifest = self.outputs.load(key) if self.outputs else None
+        if not manifest:
+            return
+        for path in manifest.get("outputs", {}):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.outputs.forget(key)
+
+    @staticmethod
+    def _transcript_inputs(txt_file):
+        sidecar = sidecar_path(txt_file)
+        return [txt_file] + ([sidecar] if os.path.exists(sidecar) else [])
+
+    @traced("model.transcribe_video")
+    def transcribe_video(self, video_path, log_callback, progress_callback=None, model_name=WHISPER_MODEL,
+                         long_form=None, resume=True):
+        """
+        Transcribes in silence-aligned chunks that are checkpointed as they finish,
+        so a crashed or edited run only redoes the missing/changed chunks.
+        long_form=None picks automatically: recordings longer than LONGFORM_MIN_DURATION
+        use parallel worker processes instead of the shared in-process model.
+        """
+        base_name = os.path.splitext(video_path)[0]
+        output_file = f"{base_name}_transcript.txt"
+        params = {"model": model_name, "word_timestamps": TRANSCRIBE_WORD_TIMESTAMPS}
+        if self._up_to_date(output_file, "transcribe", [video_path], params, log_callback):
+            return True
+
         log_callback(f"🎧 Engine: Transcribing {os.path.basename(video_path)}...")
         try:
-            model = whisper.load_model("base")
-            result = model.transcribe(video_path)
-            
-            base_name = os.path.splitext(video_path)[0]
-            output_file = f"{base_name}_transcript.txt"
-            
-            with open(output_file, "w", encoding="utf-8") as f:
-                for segment in result["segments"]:
-                    line = f"[{int(segment['start'])}s - {int(segment['end'])}s]: {segment['text']}\n"
-                    f.write(line)
-            
+            from .longform import transcribe_chunked  # numpy; deferred to keep start-up fast
+            if long_form is None:
+                long_form = (probe_duration(video_path) or 0) > LONGFORM_MIN_DURATION
+
+            result = transcribe_chunked(video_path, model_name, log_callback, progress_callback,
+                                        workers=LONGFORM_WORKERS if long_form else 1,
+                                        word_timestamps=TRANSCRIBE_WORD_TIMESTAMPS, resume=resume)
+            if not long_form:
+                stats = registry.stats()
+                log_callback(f"🧠 Model cache: {stats['hits']} hits / {stats['misses']} misses, "
+                             f"{stats['load_seconds']}s loading")
+
+            # The sidecar keeps Whisper's float timings (and words); the .txt is just an export
+            transcript = Transcript.from_whisper(result)
+            transcript.write_txt(output_file)
+            transcript.save(output_file)
+            self._remember(output_file, "transcribe", [video_path], params, [output_file, sidecar_path(output_file)])
+
             log_callback(f"✅ Saved: {os.path.basename(output_file)}")
             return True
         except Exception as e:
             log_callback(f"❌ Error: {e}")
             return False
 
-    def translate_text(self, txt_file, target_lang, log_callback, progress_callback):
+    @traced("model.translate_text")
+    def translate_text(self, txt_file, target_lang, log_callback, progress_callback, backend=None, memory=None):
         if not txt_file or not os.path.exists(txt_file):
             log_callback("⚠️ File not found.")
             return False
 
-        log_callback(f"🌍 Engine: Translating to '{target_lang}'...")
-        translator = GoogleTranslator(source='auto', target=target_lang)
         output_file = txt_file.replace(".txt", f"_{target_lang}.txt")
+        inputs = self._transcript_inputs(txt_file)
+        params = {"target": target_lang, "backend": getattr(backend, "name", "google")}
+        if self._up_to_date(output_file, "translate", inputs, params, log_callback):
+            return True
+
+        log_callback(f"🌍 Engine: Translating to '{target_lang}'...")
 
         try:
-            with open(txt_file, "r", encoding="utf-8") as infile:
-                lines = infile.readlines()
-
-            total = len(lines)
-            with open(output_file, "w", encoding="utf-8") as outfile:
-                for i, line in enumerate(lines):
-                    match = re.match(r"(\[.*?\]):\s*(.*)", line)
-                    if match and match.group(2).strip():
-                        try:
-                            tr = translator.translate(match.group(2))
-                            outfile.write(f"{match.group(1)}: {tr}\n")
-                        except Exception:
-                            outfile.write(line)
-                    else:
-                        outfile.write(line)
-                    
-                    if progress_callback:
-                        progress_callback((i + 1) / total)
+            from .translation import TranslationPipeline, GoogleBackend
+            memory = memory or self._translation_memory()
+            pipeline = TranslationPipeline(backend or GoogleBackend(target_lang), memory=memory)
+            source = Transcript.load(txt_file)
+            texts = [source.text(i) for i in range(len(source))]
+            # "[label]: text" lines are translated after the label; other untimed lines pass through
+            labelled = {i: split_label(line) for i, (_, line) in enumerate(source.raw)}
+            labelled = {i: parts for i, parts in labelled.items() if parts and parts[1]}
+            requested = texts + [text for _, text in labelled.values()]
+            translated = pipeline.translate(requested, progress_callback)
 
+            # Timings are carried over untouched; failed lines keep their original text
+            result = Transcript(language=target_lang)
+            for i, tr in enumerate(translated[:len(texts)]):
+                result.append(source.starts[i], source.ends[i], tr or texts[i])
+            result.raw = list(source.raw)
+            for (i, (label, _)), tr in zip(labelled.items(), translated[len(texts):]):
+                if tr:
+                    result.raw[i] = (source.raw[i][0], f"{label}: {tr}")
+            result.write_txt(output_file)
+            result.save(output_file)
+            self._remember(output_file, "translate", inputs, params, [output_file, sidecar_path(output_file)])
+
+            unique = len({t.strip() for t in requested if t.strip()})
+            log_callback(f"📦 {sum(1 for t in requested if t.strip())} lines, {unique} unique, "
+                         f"{pipeline.calls} request(s)")
+            if memory:
+                looked_up = pipeline.memory_hits + pipeline.memory_misses
+                rate = pipeline.memory_hits / looked_up if looked_up else 0.0
+                log_callback(f"🧠 Translation memory: {pipeline.memory_hits} hits / "
+                             f"{pipeline.memory_misses} misses ({rate:.0%})")
             log_callback(f"✅ Translated: {os.path.basename(output_file)}")
             return True
         except Exception as e:
             log_callback(f"❌ Error: {e}")
             return False
 
+    @traced("model.convert_to_vtt")
     def convert_to_vtt(self, txt_file, log_callback, progress_callback):
+        return self.export_subtitles(txt_file, ["vtt"], log_callback, progress_callback)
+
+    @traced("model.export_subtitles")
+    def export_subtitles(self, txt_file, formats, log_callback, progress_callback,
+                         max_chars=SUBTITLE_MAX_CHARS, max_duration=SUBTITLE_MAX_DURATION):
         if not txt_file or not os.path.exists(txt_file):
             log_callback("⚠️ File not found.")
             return False
 
-        output_vtt = txt_file.replace(".txt", ".vtt")
-        log_callback("📜 Converting to VTT...")
+        key = os.path.splitext(txt_file)[0] + ".subtitles"
+        inputs = self._transcript_inputs(txt_file)
+        params = {"formats": sorted(f.lower() for f in formats), "max_chars": max_chars, "max_duration": max_duration}
+        if self._up_to_date(key, "subtitles", inputs, params, log_callback):
+            return True
+
+        log_callback(f"📜 Exporting {', '.join(f.upper() for f in formats)}...")
 
         try:
-            with open(txt_file, 'r', encoding='utf-8') as infile:
-                lines = infile.readlines()
-
-            total = len(lines)
-            with open(output_vtt, 'w', encoding='utf-8') as outfile:
-                outfile.write("WEBVTT\n\n")
-                for i, line in enumerate(lines):
-                    match = re.search(r'\[(\d+)s\s*-\s*(\d+)s\]:\s*(.*)', line)
-                    if match:
-                        start = seconds_to_vtt_fmt(match.group(1))
-                        end = seconds_to_vtt_fmt(match.group(2))
-                        text = match.group(3).strip()
-                        outfile.write(f"{start} --> {end}\n{text}\n\n")
-                    
-                    if progress_callback:
-                        progress_callback((i + 1) / total)
-            
-            log_callback(f"✅ VTT Ready: {os.path.basename(output_vtt)}")
+            paths = export_subtitles(txt_file, formats, progress_callback=progress_callback,
+                                     max_chars=max_chars, max_duration=max_duration)
+            self._remember(key, "subtitles", inputs, params, paths)
+            log_callback(f"✅ Subtitles Ready: {', '.join(os.path.basename(p) for p in paths)}")
             return True
         except Exception as e:
             log_callback(f"❌ Error: {e}")
             return False
 
-    def slice_whatsapp(self, video_path, log_callback):
-        log_callback("📱 Engine: Slicing 3-min chunks...")
+    @traced("model.slice_whatsapp")
+    def slice_whatsapp(self, video_path, log_callback, progress_callback=None, profile=WHATSAPP_PROFILE,
+                       concurrent=SLICE_CONCURRENT):
+        """
+        Splits the video into shareable parts using an encode profile (see profiles.py):
+        'whatsapp-16MB' copies what fits the size limit and re-encodes only the rest;
+        'whatsapp-balanced' copies N equal parts (concurrent: all at once).
+        """
+        try:
+            profile = get_profile(profile)
+        except ValueError as e:
+            log_callback(f"❌ {e}")
+            return False
         base = os.path.splitext(os.path.basename(video_path))[0]
         folder = os.path.join(os.path.dirname(video_path), f"WhatsApp_{base}")
-        
+        params = {"profile": vars(profile)}
+        if self._up_to_date(folder, "whatsapp", [video_path], params, log_callback):
+            return True
+        log_callback(f"📱 Engine: Slicing for WhatsApp ({profile.name})...")
+
         if not os.path.exists(folder):
             os.makedirs(folder)
-            
-        pat = os.path.join(folder, f"{base}_part%03d.mp4")
-        cmd = [
-            "ffmpeg", "-y", "-i", video_path, "-c", "copy", "-map", "0",
-            "-f", "segment", "-segment_time", "180", "-reset_timestamps", "1", pat
-        ]
-        
-        success = run_ffmpeg_command(cmd, log_callback)
+        self._discard_outputs(folder)  # A different part count must not leave stale parts behind
+
+        try:
+            success = slice_to_profile(video_path, folder, base, profile, log_callback, progress_callback,
+                                       concurrent=concurrent)
+        except Exception as e:
+            log_callback(f"❌ Error: {e}")
+            return False
         if success:
+            parts = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                           if f.startswith(f"{base}_part") and f.endswith(".mp4"))
+            self._remember(folder, "whatsapp", [video_path], params, parts)
             log_callback(f"📂 Check folder: /WhatsApp_{base}")
         return success
 
-    def slice_topics(self, video_path, raw_text, log_callback):
+    @traced("model.detect_topics")
+    def detect_topics(self, video_path, log_callback, progress_callback=None):
+        """
+        Proposes chapters from scene changes, silences and (when present) the
+        transcript, and writes them to <video>_topics.txt for slice_topics.
+        """
+        base_name = os.path.splitext(video_path)[0]
+        transcript = f"{base_name}_transcript.txt"
+        output_file = f"{base_name}_topics.txt"
+        inputs = [video_path] + ([transcript] if os.path.exists(transcript) else [])
+        params = {"fps": SEGMENT_FPS, "target": SEGMENT_TARGET_SECONDS, "search": SEGMENT_SEARCH_SECONDS,
+                  "min": SEGMENT_MIN_SECONDS, "weights": SEGMENT_WEIGHTS}
+        if self._up_to_date(output_file, "detect_topics", inputs, params, log_callback):
+            return True
+
+        log_callback(f"🧭 Engine: Detecting topics in {os.path.basename(video_path)}...")
+        try:
+            from .segmenter import detect_topics  # numpy; deferred to keep start-up fast
+            text = detect_topics(video_path, log_callback, progress_callback, transcript=transcript)
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+            self._remember(output_file, "detect_topics", inputs, params, [output_file])
+            log_callback(f"✅ Saved: {os.path.basename(output_file)}")
+            return True
+        except Exception as e:
+            log_callback(f"❌ Error: {e}")
+            return False
+
+    @traced("model.slice_topics")
+    def slice_topics(self, video_path, raw_text, log_callback, progress_callback=None, mode=TOPIC_SLICE_MODE):
+        """
+        Exports one clip per topic line.
+        Modes: 'single_pass' cuts every topic from one read of the source (one
+        ffmpeg, many outputs); 'seek' runs one ffmpeg per topic with input-side
+        seeking, in parallel on the worker pool; 'smart' makes frame-accurate cuts
+        (see cutter.smart_cut); 'per_topic' is the legacy loop that demuxes from the start each time.
+        """
         log_callback("✂️ Engine: Processing topics...")
-        topics = []
-        for line in raw_text.strip().split('\n'):
-            if not line.strip(): continue
-            # Matches: 00:00 - 05:00 : Title
-            match = re.search(r"(\d+:?\d*:?\d*)\s*[-to\s]+\s*(\d+:?\d*:?\d*)\s*[:|-]?\s*(.*)", line)
-            if match:
-                topics.append({
-                    "start": match.group(1),
-                    "end": match.group(2),
-                    "title": match.group(3).strip().replace(" ", "_").replace("/", "-")
-                })
+        if not os.path.exists(video_path):
+            log_callback("⚠️ File not found.")
+            return False
+        # Everything is validated against the real duration before any ffmpeg starts
+        index = get_media_index(video_path, build=False)
+        duration = index.duration if index else probe_duration(video_path)
+        parsed, issues = parse_topics(raw_text, duration)
+        for issue in issues:
+            icon = "🩹" if issue.repaired else "⚠️ Skipped"
+            log_callback(f"{icon} line {issue.line}: {issue.message} ({issue.text})")
+        topics = [{"start": t.start, "end": t.end, "title": t.title} for t in parsed]
 
         if not topics:
             log_callback("❌ No valid topics found.")
@@ -140,18 +287,186 @@ class ClipOpsModel:
         if not os.path.exists(folder): os.makedirs(folder)
 
         for idx, t in enumerate(topics):
-            fname = f"{idx+1:02d}_{t['title']}.mp4"
-            out_path = os.path.join(folder, fname)
-            log_callback(f"⚡ Cutting: {t['title']}...")
-            
-            cmd = ["ffmpeg", "-y", "-i", video_path, "-ss", t['start'], "-to", t['end'], "-c", "copy", out_path]
-            run_ffmpeg_command(cmd, log_callback)
-        
-        log_callback("🎉 All topics exported!")
-        return True
-
-    def manual_cut(self, video_path, start, end, log_callback):
+            t["out"] = os.path.join(folder, f"{idx+1:02d}_{t['title']}.mp4")
+            t["params"] = {"start": round(t["start"], 3), "end": round(t["end"], 3), "mode": mode}
+
+        topics = self._pending_topics(video_path, folder, topics, log_callback)
+        if not topics:
+            if progress_callback:
+                progress_callback(1.0)
+            log_callback("🎉 All topics exported!")
+            return True
+
+        if mode != "smart":
+            self._warn_keyframe_snap(video_path, [t['start'] for t in topics], log_callback)
+
+        if mode == "smart":
+            ok = self._slice_topics_smart(video_path, topics, log_callback, progress_callback)
+        elif mode == "single_pass":
+            ok = self._slice_topics_single_pass(video_path, topics, log_callback, progress_callback)
+        else:
+            ok = self._slice_topics_per_topic(video_path, topics, log_callback, progress_callback, seek=(mode == "seek"))
+
+        if ok:
+            for t in topics:
+                self._remember(t["out"], "topic", [video_path], t["params"], [t["out"]])
+            log_callback("🎉 All topics exported!")
+        return ok
+
+    def _pending_topics(self, video_path, folder, topics, log_callback):
+        """
+        Drops topics whose clip is already up to date. A clip cut earlier for the
+        same range under another name (topics renumbered or retitled) is renamed
+        instead of cut again.
+        """
+        if not self.outputs:
+            return topics
+        pending = [t for t in topics if not self.outputs.is_current(t["out"], "topic", [video_path], t["params"])]
+        if len(pending) < len(topics):
+            log_callback(f"♻️ {len(topics) - len(pending)} topic(s) up to date, skipped")
+
+        targets = {os.path.abspath(t["out"]) for t in topics}
+        candidates = []
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if name.endswith(".mp4") and os.path.abspath(path) not in targets:
+                manifest = self.outputs.load(path)
+                if manifest and manifest.get("op") == "topic":
+                    candidates.append((path, manifest))
+
+        remaining = []
+        for t in pending:
+            found = next((c for c in candidates if self.outputs.matches(c[1], "topic", [video_path], t["params"])), None)
+            if not found:
+                remaining.append(t)
+                continue
+            candidates.remove(found)
+            try:
+                os.replace(found[0], t["out"])
+            except OSError:
+                remaining.append(t)
+                continue
+            self.outputs.forget(found[0])
+            self._remember(t["out"], "topic", [video_path], t["params"], [t["out"]])
+            log_callback(f"♻️ Renamed: {os.path.basename(found[0])} → {os.path.basename(t['out'])}")
+        return remaining
+
+    def _slice_topics_single_pass(self, video_path, topics, log_callback, progress_callback=None):
+        ok = True
+        batches = [topics[i:i + TOPIC_OUTPUTS_PER_PASS] for i in range(0, len(topics), TOPIC_OUTPUTS_PER_PASS)]
+        for n, batch in enumerate(batches):
+            log_callback(f"⚡ Cutting {len(batch)} topics in one pass...")
+            cmd = ["ffmpeg", "-y", "-i", video_path]
+            for t in batch:
+                cmd += ["-ss", f"{t['start']:.3f}", "-to", f"{t['end']:.3f}", "-c", "copy", "-avoid_negative_ts", "make_zero", t["out"]]
+
+            # The pass reads the source up to the last topic end
+            report = None
+            if progress_callback:
+                report = lambda f, n=n: progress_callback((n + f) / len(batches))
+            duration = max(t['end'] for t in batch)
+            ok = run_ffmpeg_command(cmd, log_callback, progress_callback=report, duration=duration) and ok
+        return ok
+
+    def _slice_topics_per_topic(self, video_path, topics, log_callback, progress_callback=None, seek=True):
+        if not seek:
+            ok = True
+            for i, t in enumerate(topics):
+                log_callback(f"⚡ Cutting: {t['title']}...")
+                cmd = ["ffmpeg", "-y", "-i", video_path, "-ss", f"{t['start']:.3f}", "-to", f"{t['end']:.3f}", "-c", "copy", t["out"]]
+                ok = run_ffmpeg_command(cmd, log_callback) and ok
+                if progress_callback:
+                    progress_callback((i + 1) / len(topics))
+            return ok
+
+        cmds = []
+        for t in topics:
+            start = t['start']
+            duration = t['end'] - start
+            cmds.append(["ffmpeg", "-y", "-ss", f"{start:.3f}", "-i", video_path, "-t", f"{duration:.3f}",
+                         "-c", "copy", "-avoid_negative_ts", "make_zero", t["out"]])
+        log_callback(f"⚡ Cutting {len(cmds)} topics (up to {ffmpeg_pool.limits['copy']} at once)...")
+        return all(ffmpeg_pool.run(cmds, log_callback, progress_callback=progress_callback))
+
+    def _slice_topics_smart(self, video_path, topics, log_callback, progress_callback=None):
+        try:
+            index = get_media_index(video_path, log_callback)
+            ok = True
+            for i, t in enumerate(topics):
+                log_callback(f"🎯 Cutting: {t['title']}...")
+                report = (lambda f, i=i: progress_callback((i + f) / len(topics))) if progress_callback else None
+                ok = smart_cut(video_path, t['start'], t['end'], t["out"],
+                               log_callback, report, index=index) and ok
+            return ok
+        except Exception as e:
+            log_callback(f"❌ Error: {e}")
+            return False
+
+    def _warn_keyframe_snap(self, video_path, starts, log_callback):
+        """Stream copies start on the previous keyframe; say so when the index is already cached."""
+        try:
+            index = get_media_index(video_path, build=False)
+        except OSError:
+            return  # Missing source; the ffmpeg run reports it
+        if not index:
+            return
+        snapped = [s for s in starts if not index.is_keyframe(s)]
+        if snapped:
+            log_callback(f"⚠️ {len(snapped)} cut(s) are not on keyframes and will snap to the previous one "
+                         f"(use smart mode for frame accuracy).")
+
+    @traced("model.build_preview")
+    def build_preview(self, video_path, log_callback, progress_callback=None):
+        """
+        Proxy video, thumbnail sprite and waveform peaks for the timeline, from
+        one low-priority ffmpeg pass (cached; see preview.py).
+        """
+        try:
+            from .preview import build_preview  # numpy; deferred to keep start-up fast
+            preview = build_preview(video_path, log_callback, progress_callback)
+        except Exception as e:
+            log_callback(f"❌ Error: {e}")
+            return False
+        if preview:
+            log_callback(f"✅ Preview ready ({preview.thumbs} thumbnails)")
+        return preview is not None
+
+    def load_preview(self, video_path):
+        """The cached Preview for `video_path`, or None (never runs ffmpeg)."""
+        if not os.path.exists(video_path):
+            return None
+        # Called on the UI thread: only pay for the numpy import when a preview exists
+        if not os.path.exists(os.path.join(preview_folder(video_path), "meta.json")):
+            return None
+        from .preview import load_preview
+        return load_preview(video_path)
+
+    @traced("model.manual_cut")
+    def manual_cut(self, video_path, start, end, log_callback, progress_callback=None, precise=SMART_CUT):
         log_callback(f"✂️ Cutting {start} to {end}...")
+        try:
+            start, end = parse_time(start), parse_time(end)
+        except ValueError as e:
+            log_callback(f"❌ {e}")
+            return False
+        if end <= start:
+            log_callback("❌ End time must be after start time.")
+            return False
+
         output = os.path.splitext(video_path)[0] + "_cut.mp4"
-        cmd = ["ffmpeg", "-y", "-i", video_path, "-ss", start, "-to", end, "-c", "copy", output]
-        return run_ffmpeg_command(cmd, log_callback)
\ No newline at end of file
+        params = {"start": round(start, 3), "end": round(end, 3), "precise": bool(precise)}
+        if self._up_to_date(output, "manual_cut", [video_path], params, log_callback):
+            return True
+        if precise:
+            try:
+                ok = smart_cut(video_path, start, end, output, log_callback, progress_callback)
+            except Exception as e:
+                log_callback(f"❌ Error: {e}")
+                return False
+        else:
+            self._warn_keyframe_snap(video_path, [start], log_callback)
+            cmd = ["ffmpeg", "-y", "-i", video_path, "-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-c", "copy", output]
+            ok = run_ffmpeg_command(cmd, log_callback, progress_callback=progress_callback)
+        if ok:
+            self._remember(output, "manual_cut", [video_path], params, [output])
+        return ok
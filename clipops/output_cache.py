@@ -0,0 +1,95 @@
+# clipops/output_cache.py
+
+import hashlib
+import json
+import os
+import threading
+from .config import CACHE_DIR
+from .utils import file_fingerprint
+
+MANIFEST_VERSION = 1
+
+
+class OutputCache:
+    """
+    One small manifest per produced output: the operation, the fingerprints of
+    its inputs (size, mtime, sampled hash), its parameters and the fingerprints
+    of the files it wrote. An operation whose manifest still matches is skipped.
+    Inputs and outputs are compared by size and content hash, so touching a file
+    does not invalidate it but editing one does.
+    """
+
+    def __init__(self, root=os.path.join(CACHE_DIR, "outputs")):
+        self.root = root
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+
+    def _manifest_path(self, key):
+        digest = hashlib.sha1(os.path.abspath(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], f"{digest}.json")
+
+    def fingerprint(self, path):
+        """file_fingerprint, memoised per (path, size, mtime) for the life of the process."""
+        st = os.stat(path)
+        memo = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if memo in self._fingerprints:
+                return self._fingerprints[memo]
+        fp = file_fingerprint(path)
+        with self._lock:
+            self._fingerprints[memo] = fp
+        return fp
+
+    def _same(self, path, recorded):
+        try:
+            fp = self.fingerprint(path)
+        except OSError:
+            return False
+        return fp["size"] == recorded.get("size") and fp["hash"] == recorded.get("hash")
+
+    def load(self, key):
+        try:
+            with open(self._manifest_path(key), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+    def matches(self, manifest, op, inputs, params):
+        """True when `manifest` was written by `op` with these inputs/params and its outputs are intact."""
+        if not manifest or manifest.get("op") != op or manifest.get("params") != _canonical(params):
+            return False
+        recorded = manifest.get("inputs", {})
+        if sorted(recorded) != sorted(os.path.abspath(p) for p in inputs):
+            return False
+        if not all(self._same(p, recorded[os.path.abspath(p)]) for p in inputs):
+            return False
+        return bool(manifest.get("outputs")) and all(self._same(p, fp) for p, fp in manifest["outputs"].items())
+
+    def is_current(self, key, op, inputs, params):
+        return self.matches(self.load(key), op, inputs, params)
+
+    def record(self, key, op, inputs, params, outputs):
+        """Writes the manifest for `key` after `op` produced `outputs` (paths) successfully."""
+        manifest = {
+            "version": MANIFEST_VERSION, "op": op, "key": os.path.abspath(key), "params": _canonical(params),
+            "inputs": {os.path.abspath(p): self.fingerprint(p) for p in inputs},
+            "outputs": {os.path.abspath(p): self.fingerprint(p) for p in outputs if os.path.exists(p)},
+        }
+        path = self._manifest_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def forget(self, key):
+        try:
+            os.remove(self._manifest_path(key))
+        except OSError:
+            pass
+
+
+def _canonical(params):
+    """JSON round-trip so tuples/lists and key order compare equal to what was stored."""
+    return json.loads(json.dumps(params, sort_keys=True))
@@ -0,0 +1,162 @@
+# clipops/preview.py
+
+"""
+Preview assets for checking cut points without opening the source.
+One low-priority ffmpeg pass writes a small proxy video, a PNG sprite sheet
+of thumbnails at a fixed interval and mono PCM, which is reduced to a uint8
+waveform peak array (.npy). Assets are cached per (path, size, mtime) next
+to the media index; keyframes come from that index, silences from the peaks.
+"""
+
+import bisect
+import json
+import math
+import os
+import tempfile
+import threading
+import numpy as np
+from .config import (PREVIEW_HEIGHT, PREVIEW_CRF, PREVIEW_THUMB_SIZE, PREVIEW_THUMB_INTERVAL,
+                     PREVIEW_MAX_THUMBS, PREVIEW_SPRITE_COLUMNS, PREVIEW_PEAKS_PER_SECOND, PREVIEW_SNAP_WINDOW)
+from .media_index import get_media_index
+from .utils import run_ffmpeg_command, preview_folder
+
+PREVIEW_VERSION = 1
+PEAK_SAMPLE_RATE = 8000
+
+
+class Preview:
+    """Loaded preview assets for one video; all lookups are in memory."""
+
+    def __init__(self, folder, meta, peaks, keyframes=()):
+        self.folder = folder
+        self.duration = meta["duration"]
+        self.interval = meta["interval"]
+        self.thumbs = meta["thumbs"]
+        self.columns = meta["columns"]
+        self.thumb_size = tuple(meta["thumb_size"])
+        self.peaks_per_second = meta["peaks_per_second"]
+        self.proxy = os.path.join(folder, "proxy.mp4")
+        self.sprite = os.path.join(folder, "sprite.png")
+        self.peaks = peaks
+        self.keyframes = list(keyframes)
+
+    def thumb_box(self, t):
+        """(x, y, w, h) of the sprite tile shown at time t."""
+        i = min(self.thumbs - 1, max(0, int(t / self.interval)))
+        w, h = self.thumb_size
+        return (i % self.columns) * w, (i // self.columns) * h, w, h
+
+    def envelope(self, width):
+        """Peak heights (0..1) for `width` pixel columns; max over the peaks each column covers."""
+        if width <= 0 or not len(self.peaks):
+            return [0.0] * max(0, width)
+        # reduceat repeats a peak for columns that share one (narrow clips on a wide canvas)
+        starts = np.linspace(0, len(self.peaks), width, endpoint=False).astype(np.int64)
+        return (np.maximum.reduceat(self.peaks, starts) / 255.0).tolist()
+
+    def snap(self, t, mode, window=PREVIEW_SNAP_WINDOW):
+        """Moves t to the nearest keyframe, or the quietest point, within ±window seconds."""
+        if mode == "keyframe" and self.keyframes:
+            i = bisect.bisect_left(self.keyframes, t)
+            near = min(self.keyframes[max(0, i - 1):i + 1], key=lambda k: abs(k - t))
+            return near if abs(near - t) <= window else t
+        if mode == "silence" and len(self.peaks):
+            lo = max(0, int((t - window) * self.peaks_per_second))
+            hi = min(len(self.peaks), int((t + window) * self.peaks_per_second) + 1)
+            if hi <= lo:
+                return t
+            quietest = self.peaks[lo:hi]
+            candidates = np.flatnonzero(quietest == quietest.min()) + lo
+            centres = (candidates + 0.5) / self.peaks_per_second
+            return float(centres[np.argmin(np.abs(centres - t))])
+        return t
+
+
+def load_preview(video_path):
+    """Returns the cached Preview for `video_path`, or None when it has not been built."""
+    try:
+        folder = preview_folder(video_path)
+        with open(os.path.join(folder, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != PREVIEW_VERSION:
+            return None
+        peaks = np.load(os.path.join(folder, "peaks.npy"))
+    except (OSError, ValueError):
+        return None
+    index = get_media_index(video_path, build=False)
+    return Preview(folder, meta, peaks, index.keyframes if index else ())
+
+
+def _peaks(pcm_path, peaks_per_second=PREVIEW_PEAKS_PER_SECOND):
+    """Max |sample| per bin, scaled to uint8."""
+    if os.path.getsize(pcm_path) < 2:
+        return np.zeros(0, dtype=np.uint8)
+    pcm = np.memmap(pcm_path, dtype=np.int16, mode="r")
+    per_bin = PEAK_SAMPLE_RATE // peaks_per_second
+    bins = math.ceil(len(pcm) / per_bin)
+    peaks = np.empty(bins, dtype=np.uint8)
+    block = 8192  # bins per block
+    for i in range(0, bins, block):
+        j = min(bins, i + block)
+        x = np.abs(np.asarray(pcm[i * per_bin:j * per_bin], dtype=np.int32))
+        x = np.pad(x, (0, (j - i) * per_bin - len(x)))
+        peaks[i:j] = np.minimum(255, x.reshape(j - i, per_bin).max(axis=1) >> 7)
+    del pcm
+    return peaks
+
+
+def build_preview(video_path, log_callback, progress_callback=None):
+    """Builds (or reuses) the preview assets for `video_path`; returns a Preview or None on failure."""
+    cached = load_preview(video_path)
+    if cached:
+        log_callback("♻️ Preview already built.")
+        return cached
+
+    index = get_media_index(video_path, log_callback)
+    duration = index.duration
+    if not duration:
+        log_callback("❌ Unknown duration; cannot build a preview.")
+        return None
+
+    interval = max(PREVIEW_THUMB_INTERVAL, duration / PREVIEW_MAX_THUMBS)
+    thumbs = max(1, math.ceil(duration / interval))
+    columns = min(PREVIEW_SPRITE_COLUMNS, thumbs)
+    rows = math.ceil(thumbs / columns)
+    w, h = PREVIEW_THUMB_SIZE
+
+    folder = preview_folder(video_path)
+    os.makedirs(folder, exist_ok=True)
+    fd, pcm_path = tempfile.mkstemp(prefix="clipops_peaks_", suffix=".s16")
+    os.close(fd)
+
+    graph = ["[0:v]split=2[p][s]",
+             f"[p]scale=-2:{PREVIEW_HEIGHT}[proxy]",
+             f"[s]fps=1/{interval:.6f},scale={w}:{h}:force_original_aspect_ratio=decrease,"
+             f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,tile={columns}x{rows}[sheet]"]
+    cmd = ["ffmpeg", "-y", "-i", video_path, "-filter_complex", ";".join(graph),
+           # Proxy: a keyframe every second so scrubbing it is cheap
+           "-map", "[proxy]", "-map", "0:a:0?", "-c:v", "libx264", "-preset", "ultrafast", "-crf", str(PREVIEW_CRF),
+           "-force_key_frames", "expr:gte(t,n_forced)", "-c:a", "aac", "-b:a", "64k",
+           "-movflags", "+faststart", os.path.join(folder, "proxy.mp4"),
+           "-map", "[sheet]", "-frames:v", "1", os.path.join(folder, "sprite.png")]
+    if index.has_audio:
+        # An output with no streams makes ffmpeg fail; silent videos get an empty waveform instead
+        cmd += ["-map", "0:a:0", "-ac", "1", "-ar", str(PEAK_SAMPLE_RATE), "-f", "s16le", pcm_path]
+
+    log_callback(f"🎞️ Building preview: proxy {PREVIEW_HEIGHT}p, {thumbs} thumbnails, waveform...")
+    try:
+        if not run_ffmpeg_command(cmd, log_callback, progress_callback=progress_callback, duration=duration,
+                                  low_priority=True):
+            return None
+        np.save(os.path.join(folder, "peaks.npy"), _peaks(pcm_path))
+    finally:
+        os.remove(pcm_path)
+
+    # meta.json is written last: its presence marks a complete set of assets
+    meta = {"version": PREVIEW_VERSION, "duration": duration, "interval": interval, "thumbs": thumbs,
+            "columns": columns, "thumb_size": [w, h], "peaks_per_second": PREVIEW_PEAKS_PER_SECOND}
+    tmp = os.path.join(folder, f"meta.json.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(folder, "meta.json"))
+    return load_preview(video_path)
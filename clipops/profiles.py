@@ -0,0 +1,106 @@
+# clipops/profiles.py
+
+"""
+Encode profiles: how a slice is written (stream copy, CRF or size-targeted
+bitrate on the CPU encoders) and what it must fit (byte budget, length).
+Profiles only build ffmpeg arguments; slicer.py decides which parts need them.
+"""
+
+from .config import CPU_COUNT, FFMPEG_ENCODE_WORKERS
+
+MUX_OVERHEAD = 0.03    # Container overhead reserved out of a byte budget
+MIN_VIDEO_KBPS = 100   # Below this, x264/x265 output is not worth sending
+
+
+class EncodeProfile:
+    """
+    mode: 'copy' (stream copy), 'crf' (constant quality) or 'bitrate' (sized
+    from max_bytes and the part's duration; two_pass for a tighter fit).
+    threads=0 shares the CPU evenly between concurrent encodes.
+    balanced (no byte budget only) splits into equal parts of at most
+    max_seconds instead of max_seconds parts plus a short remainder.
+    """
+
+    def __init__(self, name, mode, vcodec="libx264", preset="veryfast", crf=23, max_bytes=None,
+                 max_seconds=None, min_seconds=0, audio_kbps=128, max_height=None, two_pass=False, threads=0,
+                 balanced=False):
+        self.name = name
+        self.mode = mode
+        self.vcodec = vcodec
+        self.preset = preset
+        self.crf = crf
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.min_seconds = min_seconds
+        self.audio_kbps = audio_kbps
+        self.max_height = max_height
+        self.two_pass = two_pass
+        self.threads = threads
+        self.balanced = balanced
+
+    @property
+    def is_copy(self):
+        return self.mode == "copy"
+
+    def video_kbps(self, duration):
+        """Video bitrate that makes `duration` seconds fit max_bytes (None without a budget)."""
+        if not self.max_bytes or duration <= 0:
+            return None
+        total_kbps = self.max_bytes * 8 * (1 - MUX_OVERHEAD) / duration / 1000
+        return max(MIN_VIDEO_KBPS, int(total_kbps - self.audio_kbps))
+
+    def thread_count(self):
+        return self.threads or max(1, CPU_COUNT // FFMPEG_ENCODE_WORKERS)
+
+    def _x265_params(self, extra):
+        return ["-x265-params", ":".join(["log-level=error"] + extra)]
+
+    def encode_args(self, duration=None, pass_no=None, passlog=None):
+        """
+        Output-side codec arguments for one part.
+        For two-pass encodes call once with pass_no=1 (output to null) and once with pass_no=2.
+        """
+        if self.is_copy:
+            return ["-c", "copy"]
+
+        args = ["-c:v", self.vcodec, "-preset", self.preset, "-threads", str(self.thread_count()), "-pix_fmt", "yuv420p"]
+        if self.max_height:
+            args += ["-vf", f"scale=-2:'min({self.max_height},ih)'"]
+
+        kbps = self.video_kbps(duration) if self.mode == "bitrate" else None
+        x265 = []
+        if kbps:
+            args += ["-b:v", f"{kbps}k", "-maxrate", f"{int(kbps * 1.5)}k", "-bufsize", f"{kbps * 2}k"]
+            if pass_no:
+                if self.vcodec == "libx265":
+                    x265 += [f"pass={pass_no}", f"stats={passlog}.log"]
+                else:
+                    args += ["-pass", str(pass_no), "-passlogfile", passlog]
+        else:
+            args += ["-crf", str(self.crf)]
+        if self.vcodec == "libx265":
+            args += self._x265_params(x265) + ["-tag:v", "hvc1"]
+
+        if pass_no == 1:
+            return args + ["-an", "-f", "null"]
+        return args + ["-c:a", "aac", "-b:a", f"{self.audio_kbps}k", "-movflags", "+faststart"]
+
+
+PROFILES = {p.name: p for p in (
+    EncodeProfile("archive-copy", "copy", max_seconds=180),
+    EncodeProfile("whatsapp-balanced", "copy", max_seconds=180, balanced=True),
+    EncodeProfile("whatsapp-16MB", "bitrate", max_bytes=16 * 1000 * 1000, max_seconds=180, min_seconds=60,
+                  audio_kbps=96, max_height=720, two_pass=True),
+    EncodeProfile("x264-crf", "crf", vcodec="libx264", preset="medium", crf=23, max_seconds=180),
+    EncodeProfile("x265-crf", "crf", vcodec="libx265", preset="medium", crf=28, max_seconds=180),
+)}
+
+
+def get_profile(profile):
+    """Accepts a profile name or an EncodeProfile."""
+    if isinstance(profile, EncodeProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown encode profile: {profile} (choose from {', '.join(PROFILES)})")
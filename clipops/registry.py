@@ -0,0 +1,188 @@
+# clipops/registry.py
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from .config import WHISPER_MODEL, WHISPER_DEVICE, WHISPER_DTYPE, MODEL_CACHE_SIZE, MODEL_MEMORY_BUDGET_MB, MODEL_IDLE_TIMEOUT
+from .tracing import span
+
+
+def _load_whisper(name, device, dtype):
+    """Default loader: imports Whisper only when the first model is needed."""
+    import whisper
+    model = whisper.load_model(name, device=None if device == "auto" else device)
+    if dtype == "float16" and getattr(model, "device", None) is not None and model.device.type != "cpu":
+        model = model.half()
+    return model
+
+
+def _model_bytes(model):
+    """Best-effort size of a torch module's weights (0 if unknown)."""
+    try:
+        return sum(p.numel() * p.element_size() for p in model.parameters())
+    except Exception:
+        return 0
+
+
+class _Entry:
+    def __init__(self, model, size):
+        self.model = model
+        self.size = size
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self.lock = threading.Lock()  # Whisper models are not safe to share mid-transcribe
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded Whisper models.
+    Models are keyed by (name, device, dtype), reused across calls and unloaded
+    when idle for too long or when the count / memory budget is exceeded (LRU).
+    """
+
+    def __init__(self, loader=None, max_models=MODEL_CACHE_SIZE, max_bytes=MODEL_MEMORY_BUDGET_MB * 1024 * 1024,
+                 idle_timeout=MODEL_IDLE_TIMEOUT):
+        self.loader = loader or _load_whisper
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading = {}
+        self._janitor = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    # --- Public API ---
+    @contextmanager
+    def acquire(self, name=WHISPER_MODEL, device=WHISPER_DEVICE, dtype=WHISPER_DTYPE):
+        """Yields a loaded model, pinned against eviction and locked for exclusive use."""
+        entry = self._get_entry((name, device or "auto", dtype))
+        with entry.lock:
+            try:
+                yield entry.model
+            finally:
+                with self._lock:
+                    entry.in_use -= 1
+                    entry.last_used = time.monotonic()
+
+    def get(self, name=WHISPER_MODEL, device=WHISPER_DEVICE, dtype=WHISPER_DTYPE):
+        """Returns a cached model without pinning it (callers must not hold it long)."""
+        entry = self._get_entry((name, device or "auto", dtype))
+        with self._lock:
+            entry.in_use -= 1
+        return entry.model
+
+    def unload(self, key=None):
+        """Drops one model (by key) or every idle model when key is None."""
+        with self._lock:
+            keys = [key] if key else list(self._entries)
+            for k in keys:
+                entry = self._entries.get(k)
+                if entry and not entry.in_use:
+                    self._evict(k)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_seconds": round(self.load_seconds, 3),
+                "loaded": ["/".join(k) for k in self._entries],
+                "loaded_mb": round(sum(e.size for e in self._entries.values()) / (1024 * 1024), 1),
+            }
+
+    # --- Internals ---
+    def _get_entry(self, key):
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    entry.in_use += 1
+                    entry.last_used = time.monotonic()
+                    self._entries.move_to_end(key)
+                    return entry
+
+                pending = self._loading.get(key)
+                if pending is None:
+                    pending = self._loading[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another thread is loading the same model; wait and re-check
+            pending.wait()
+
+        try:
+            t0 = time.perf_counter()
+            with span("whisper.load", model=key[0]):
+                model = self.loader(*key)
+            elapsed = time.perf_counter() - t0
+            entry = _Entry(model, _model_bytes(model))
+            with self._lock:
+                self.load_seconds += elapsed
+                entry.in_use += 1
+                self._entries[key] = entry
+                self._enforce_budget()
+                self._start_janitor()
+            return entry
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    def _enforce_budget(self):
+        def over():
+            total = sum(e.size for e in self._entries.values())
+            return len(self._entries) > self.max_models or (self.max_bytes and total > self.max_bytes)
+
+        for key in list(self._entries):
+            if not over():
+                break
+            if not self._entries[key].in_use:
+                self._evict(key)
+
+    def _evict(self, key):
+        self._entries.pop(key, None)
+        self.evictions += 1
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            try:
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except Exception:
+                pass
+
+    def _expire_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if not entry.in_use and now - entry.last_used > self.idle_timeout:
+                    self._evict(key)
+            if not self._entries:
+                self._janitor = None
+                return False
+            return True
+
+    def _start_janitor(self):
+        if not self.idle_timeout or self._janitor is not None:
+            return
+
+        def loop():
+            interval = max(1.0, min(self.idle_timeout / 2.0, 30.0))
+            while True:
+                time.sleep(interval)
+                if not self._expire_idle():
+                    break
+
+        self._janitor = threading.Thread(target=loop, name="clipops-model-janitor", daemon=True)
+        self._janitor.start()
+
+
+# Shared by every ClipOpsModel in this process
+registry = ModelRegistry()
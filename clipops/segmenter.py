@@ -0,0 +1,193 @@
+# clipops/segmenter.py
+
+"""
+Automatic topic segmentation.
+One ffmpeg pass streams tiny grayscale frames (scene changes) to stdout and
+writes mono PCM (silences, if there is audio) to a temp file at the same time. Both are scored
+per analysis bin with NumPy and combined with transcript segment gaps; cut
+points are then picked near a target chapter length, on the best-scoring bin.
+The result is topic text in the format slice_topics already reads.
+"""
+
+import math
+import os
+import subprocess
+import tempfile
+import threading
+from collections import deque
+import numpy as np
+from .config import (SEGMENT_FPS, SEGMENT_TARGET_SECONDS, SEGMENT_SEARCH_SECONDS, SEGMENT_MIN_SECONDS,
+                     SEGMENT_WEIGHTS, SAMPLE_RATE, FFMPEG_LOG_LINES)
+from .media_index import get_media_index
+from .tasks import register_process
+from .tracing import tracer
+from .transcript import iter_segments
+from .utils import resolve_tool, hidden_startupinfo, seconds_to_vtt_fmt
+
+FRAME_W, FRAME_H = 64, 36
+
+
+class Analysis:
+    """Per-bin signals (one bin = 1 / SEGMENT_FPS seconds), each scaled to 0..1."""
+
+    def __init__(self, scene, quiet, duration, fps=SEGMENT_FPS):
+        self.scene = scene
+        self.quiet = quiet
+        self.duration = duration
+        self.fps = fps
+
+
+def analyze(video_path, log_callback, progress_callback=None, fps=SEGMENT_FPS):
+    """Runs the single ffmpeg pass and returns an Analysis."""
+    index = get_media_index(video_path, log_callback)
+    duration = index.duration or 0
+    frame_bytes = FRAME_W * FRAME_H
+    fd, pcm_path = tempfile.mkstemp(prefix="clipops_seg_", suffix=".s16")
+    os.close(fd)
+
+    cmd = [resolve_tool("ffmpeg"), "-hide_banner", "-nostats", "-y", "-i", video_path,
+           "-map", "0:v:0", "-vf", f"fps={fps},scale={FRAME_W}:{FRAME_H},format=gray",
+           "-f", "rawvideo", "pipe:1"]
+    if index.has_audio:
+        # An output with no streams makes ffmpeg fail; without audio `quiet` stays all zeros
+        cmd += ["-map", "0:a:0", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", pcm_path]
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   startupinfo=hidden_startupinfo())
+        register_process(process)
+        tracer.count("subprocesses")
+        log_tail = deque(maxlen=FFMPEG_LOG_LINES)
+        drain = threading.Thread(target=lambda: log_tail.extend(l.decode("utf-8", "replace").rstrip()
+                                                                for l in process.stderr), daemon=True)
+        drain.start()
+
+        # Frame differences are computed per block as frames stream in; only the diffs are kept
+        diffs, previous, pending, seen = [], None, b"", 0
+        expected = max(1, int(duration * fps))
+        while True:
+            chunk = process.stdout.read(frame_bytes * 256)
+            if not chunk:
+                break
+            pending += chunk
+            usable = len(pending) - len(pending) % frame_bytes
+            frames = np.frombuffer(pending[:usable], dtype=np.uint8).reshape(-1, frame_bytes).astype(np.int16)
+            pending = pending[usable:]
+            if previous is not None:
+                frames = np.vstack([previous, frames])
+            diffs.append(np.abs(np.diff(frames, axis=0)).mean(axis=1))
+            previous = frames[-1:]
+            seen += len(diffs[-1])
+            if progress_callback:
+                progress_callback(min(0.99, seen / expected))
+
+        process.wait()
+        drain.join()
+        if process.returncode != 0:
+            raise RuntimeError("\n".join(list(log_tail)[-5:]) or "ffmpeg failed")
+
+        # A hard cut at frame i shows up as a jump in diff[i-1]; bin 0 has no predecessor
+        raw = np.concatenate([np.zeros(1)] + diffs) if diffs else np.zeros(0)
+        scene = np.clip(raw / (np.percentile(raw, 99) + 1e-6), 0, 1) if len(raw) else raw
+
+        quiet = np.zeros(len(scene))
+        if os.path.getsize(pcm_path) >= 2:
+            pcm = np.memmap(pcm_path, dtype=np.int16, mode="r")
+            quiet = _quiet_scores(pcm, SAMPLE_RATE // fps, len(scene))
+            del pcm
+        return Analysis(scene, quiet, duration or len(scene) / fps, fps)
+    finally:
+        os.remove(pcm_path)
+
+
+def _quiet_scores(pcm, samples_per_bin, bins):
+    """1.0 for bins well below the recording's own noise floor estimate, 0.0 for speech."""
+    n = min(bins, len(pcm) // samples_per_bin)
+    rms = np.empty(n, dtype=np.float32)
+    block = 4096  # bins per block
+    for i in range(0, n, block):
+        j = min(n, i + block)
+        x = np.asarray(pcm[i * samples_per_bin:j * samples_per_bin], dtype=np.float32).reshape(j - i, -1) / 32768
+        rms[i:j] = np.sqrt(np.mean(x * x, axis=1))
+    db = 20 * np.log10(rms + 1e-9)
+    floor = np.percentile(db, 20) if n else 0
+    quiet = np.clip((floor + 6 - db) / 12, 0, 1)
+    # Sustained pauses beat a single quiet bin between words
+    quiet = np.convolve(quiet, np.ones(3) / 3, mode="same")
+    return np.pad(quiet, (0, bins - n))
+
+
+def transcript_scores(segments, bins, fps=SEGMENT_FPS):
+    """Marks the gap between consecutive transcript segments; longer gaps score higher."""
+    score = np.zeros(bins)
+    previous_end = None
+    for seg in segments:
+        if previous_end is not None and seg.start >= previous_end:
+            i = int((previous_end + seg.start) / 2 * fps)
+            if 0 <= i < bins:
+                score[i] = max(score[i], min(1.0, 0.5 + (seg.start - previous_end)))
+        previous_end = seg.end
+    return score
+
+
+def combine(analysis, text=None, weights=SEGMENT_WEIGHTS):
+    """Weighted sum of the signals; the transcript weight is shared out when there is none."""
+    w_scene, w_quiet, w_text = weights
+    if text is None or not text.any():
+        total = w_scene + w_quiet
+        return (w_scene * analysis.scene + w_quiet * analysis.quiet) / total
+    return w_scene * analysis.scene + w_quiet * analysis.quiet + w_text * text
+
+
+def pick_cuts(score, fps=SEGMENT_FPS, target=SEGMENT_TARGET_SECONDS, search=SEGMENT_SEARCH_SECONDS,
+              minimum=SEGMENT_MIN_SECONDS):
+    """Cut times (seconds): the best-scoring bin within ±search of every target-length step."""
+    n = len(score)
+    cuts, last = [], 0
+    step, window, floor = int(target * fps), int(search * fps), int(minimum * fps)
+    while last + step + floor < n:
+        lo, hi = max(last + floor, last + step - window), min(n - floor, last + step + window)
+        if hi <= lo:
+            break
+        last = lo + int(np.argmax(score[lo:hi]))
+        cuts.append(last / fps)
+    return cuts
+
+
+def _title(segments, start, end, number, words=6):
+    """First words spoken in the chapter (or of the segment running into it)."""
+    spanning = None
+    for seg in segments:
+        if not seg.text.strip() or seg.end <= start:
+            continue
+        if seg.start >= end:
+            break
+        if seg.start >= start:
+            return " ".join(seg.text.split()[:words])
+        spanning = spanning or seg
+    return " ".join(spanning.text.split()[:words]) if spanning else f"Part {number:02d}"
+
+
+def topics_text(cuts, duration, segments=()):
+    """Formats chapters as 'HH:MM:SS - HH:MM:SS : Title' lines for slice_topics."""
+    # Whole-second cuts; the last bound is the duration to the millisecond (rounded down, so it is never clamped)
+    bounds = [0] + [round(c) for c in cuts] + [math.floor(duration * 1000) / 1000]
+
+    def fmt(t):
+        return seconds_to_vtt_fmt(t)[:8] if t == int(t) else seconds_to_vtt_fmt(t)
+
+    lines = []
+    for n, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]), 1):
+        title = _title(segments, start, end, n)
+        lines.append(f"{fmt(start)} - {fmt(end)} : {title}")
+    return "\n".join(lines)
+
+
+def detect_topics(video_path, log_callback, progress_callback=None, transcript=None):
+    """Returns topic text for `video_path`; `transcript` (optional) is a transcript path."""
+    analysis = analyze(video_path, log_callback, progress_callback)
+    segments = list(iter_segments(transcript)) if transcript and os.path.exists(transcript) else []
+    text = transcript_scores(segments, len(analysis.scene), analysis.fps) if segments else None
+    cuts = pick_cuts(combine(analysis, text), analysis.fps)
+    log_callback(f"🧭 {len(cuts) + 1} chapter(s) from scene, silence"
+                 f"{' and transcript' if segments else ''} cues")
+    return topics_text(cuts, analysis.duration, segments)
@@ -0,0 +1,205 @@
+# clipops/slicer.py
+
+"""
+Splits a video into parts according to an EncodeProfile.
+Without a byte budget this is one segment-muxer pass (copy or encode); balanced
+profiles cut the probed duration into N equal parts at keyframes, either in
+that one pass or concurrently from the precomputed offsets. Every part is
+written with +faststart by the muxer itself, so no separate remux is needed.
+With a byte budget, part boundaries are planned on keyframes from the MediaIndex byte
+offsets: parts that fit are stream-copied, and only parts that cannot fit
+(or turn out too large once written) are re-encoded at a bitrate sized to
+their duration.
+"""
+
+import bisect
+import math
+import os
+import shutil
+import tempfile
+from .media_index import get_media_index
+from .profiles import MUX_OVERHEAD, get_profile
+from .utils import run_ffmpeg_command
+from .workers import ffmpeg_pool
+
+COPY, ENCODE = "copy", "encode"
+
+
+def plan_parts(index, profile):
+    """
+    Returns [(start, end, action)] covering the whole file.
+    A part is copied when it starts on a keyframe and a keyframe-aligned end
+    within max_bytes leaves it at least min_seconds long; otherwise it is
+    encoded (ending on a keyframe when possible, so the next part can be copied).
+    """
+    duration = index.duration
+    max_seconds = profile.max_seconds or duration
+    budget = profile.max_bytes * (1 - MUX_OVERHEAD) if profile.max_bytes else None
+    keyframes = index.keyframes
+
+    parts, t = [], 0.0
+    while t < duration - 0.5:
+        limit = min(duration, t + max_seconds)
+        lo, hi = bisect.bisect_right(keyframes, t + 1e-3), bisect.bisect_right(keyframes, limit + 1e-3)
+        candidates = keyframes[lo:hi] + ([duration] if limit >= duration else [])
+        on_keyframe = t == 0.0 or index.is_keyframe(t)
+
+        base = index.bytes_at(t)
+        fitting = [c for c in candidates if budget is None or index.bytes_at(c) - base <= budget]
+        if on_keyframe and fitting and (fitting[-1] - t >= profile.min_seconds or fitting[-1] >= duration):
+            end, action = fitting[-1], COPY
+        else:
+            aligned = [c for c in candidates if c - t >= max(profile.min_seconds, 1.0)]
+            end, action = (aligned[-1] if aligned else limit), ENCODE
+        if profile.is_copy:
+            action = COPY  # Nothing to re-encode with; parts over budget are reported
+        parts.append((t, end, action))
+        t = end
+    return parts
+
+
+def balanced_cuts(duration, max_seconds, index=None):
+    """
+    Cut times for the fewest parts of at most max_seconds, all of about the same
+    length: N = ceil(duration / max_seconds), with boundary k at k * duration / N.
+    With an index (stream copies) each boundary moves to the nearest keyframe,
+    or to the one before it when the nearest would make the part too long.
+    """
+    n = max(1, math.ceil(duration / max_seconds - 1e-6))
+    cuts, last = [], 0.0
+    for k in range(1, n):
+        ideal = duration * k / n
+        t = ideal
+        if index is not None and index.keyframes:
+            near = sorted((c for c in (index.keyframe_at_or_before(ideal), index.keyframe_at_or_after(ideal))
+                           if c is not None and last < c < duration), key=lambda c: abs(c - ideal))
+            fits = [c for c in near if c - last <= max_seconds]
+            t = fits[0] if fits else (near[0] if near else None)
+        if t is not None and last < t < duration:
+            cuts.append(t)
+            last = t
+    return cuts
+
+
+def _part_cmd(video_path, start, end, codec_args, out):
+    maps = ["-map", "0:v:0?", "-map", "0:a:0?"]
+    return ["ffmpeg", "-y", "-ss", f"{start:.6f}", "-i", video_path, "-t", f"{end - start:.6f}"] + maps + codec_args + [out]
+
+
+def _segment_slice(video_path, pattern, profile, log_callback, progress_callback, cuts=None):
+    """One segment-muxer pass: every max_seconds, or at `cuts` (seconds) when given."""
+    seconds = profile.max_seconds
+    if cuts is not None:
+        # Copies: a hair early, so a keyframe whose pts rounds just below the cut is not skipped
+        times = ",".join(f"{c - 0.001 if profile.is_copy else c:.3f}" for c in cuts)
+        split, forced = ["-segment_times", times], times
+    else:
+        split, forced = ["-segment_time", str(seconds)], f"expr:gte(t,n_forced*{seconds})"
+    if profile.is_copy:
+        codec = ["-map", "0", "-c", "copy"]
+    else:
+        # Forced keyframes make every segment boundary exact
+        codec = ["-map", "0:v:0?", "-map", "0:a:0?"] + profile.encode_args() + ["-force_key_frames", forced]
+    cmd = ["ffmpeg", "-y", "-i", video_path] + codec + \
+          ["-f", "segment"] + split + ["-reset_timestamps", "1",
+                                       "-segment_format_options", "movflags=+faststart", pattern]
+    return run_ffmpeg_command(cmd, log_callback, progress_callback=progress_callback)
+
+
+def _balanced_slice(video_path, pattern, profile, log_callback, progress_callback, concurrent):
+    index = get_media_index(video_path, log_callback)
+    cuts = balanced_cuts(index.duration, profile.max_seconds, index if profile.is_copy else None)
+    bounds = [0.0] + cuts + [index.duration]
+    lengths = [e - s for s, e in zip(bounds, bounds[1:])]
+    log_callback(f"🎛️ Profile '{profile.name}': {len(lengths)} balanced part(s) of "
+                 f"{min(lengths):.0f}-{max(lengths):.0f}s{' (concurrent)' if concurrent else ''}")
+    if cuts and not concurrent:
+        return _segment_slice(video_path, pattern, profile, log_callback, progress_callback, cuts)
+
+    copy = ["-c", "copy", "-avoid_negative_ts", "make_zero", "-movflags", "+faststart"]
+    cmds = [_part_cmd(video_path, s, e, copy if profile.is_copy else profile.encode_args(e - s), pattern % i)
+            for i, (s, e) in enumerate(zip(bounds, bounds[1:]))]
+    failures = lambda m: log_callback(m) if m.startswith("❌") else None
+    return all(ffmpeg_pool.run(cmds, failures, progress_callback=progress_callback))
+
+
+def _encode(video_path, jobs, profile, work, log_callback, progress_callback):
+    """Re-encodes [(index, start, end, out)] to the profile bitrate (two passes when configured)."""
+    failures = lambda m: log_callback(m) if m.startswith("❌") else None
+    if profile.two_pass and profile.mode == "bitrate":
+        logs = [os.path.join(work, f"pass_{i}") for i, *_ in jobs]
+        first = [_part_cmd(video_path, s, e, profile.encode_args(e - s, 1, log), "-")
+                 for (_, s, e, _), log in zip(jobs, logs)]
+        half = (lambda f: progress_callback(f / 2)) if progress_callback else None
+        if not all(ffmpeg_pool.run(first, failures, progress_callback=half)):
+            return False
+        second = [_part_cmd(video_path, s, e, profile.encode_args(e - s, 2, log), out)
+                  for (_, s, e, out), log in zip(jobs, logs)]
+        rest = (lambda f: progress_callback(0.5 + f / 2)) if progress_callback else None
+        return all(ffmpeg_pool.run(second, failures, progress_callback=rest))
+
+    cmds = [_part_cmd(video_path, s, e, profile.encode_args(e - s), out) for _, s, e, out in jobs]
+    return all(ffmpeg_pool.run(cmds, failures, progress_callback=progress_callback))
+
+
+def slice_to_profile(video_path, folder, base, profile, log_callback, progress_callback=None, concurrent=False):
+    """
+    Writes <folder>/<base>_partNNN.mp4 files; returns True on success.
+    concurrent (balanced profiles) cuts every part at once on the ffmpeg pool.
+    """
+    profile = get_profile(profile)
+    pattern = os.path.join(folder, f"{base}_part%03d.mp4")
+    if not profile.max_bytes and profile.balanced:
+        return _balanced_slice(video_path, pattern, profile, log_callback, progress_callback, concurrent)
+    if not profile.max_bytes:
+        log_callback(f"🎛️ Profile '{profile.name}': {profile.max_seconds}s parts ({profile.mode})")
+        return _segment_slice(video_path, pattern, profile, log_callback, progress_callback)
+
+    index = get_media_index(video_path, log_callback)
+    parts = plan_parts(index, profile)
+    outputs = [pattern % i for i in range(len(parts))]
+    copies = [i for i, p in enumerate(parts) if p[2] == COPY]
+    log_callback(f"🎛️ Profile '{profile.name}': {len(parts)} part(s), {len(copies)} stream-copied, "
+                 f"{len(parts) - len(copies)} re-encoded (≤ {profile.max_bytes / 1e6:.0f} MB each)")
+
+    # Copying is cheap; encoding gets most of the progress bar
+    def phase(lo, hi):
+        return (lambda f: progress_callback(lo + (hi - lo) * f)) if progress_callback else None
+
+    failures = lambda m: log_callback(m) if m.startswith("❌") else None
+    split = 0.2 if len(copies) < len(parts) else 1.0
+    if copies:
+        cmds = [_part_cmd(video_path, parts[i][0], parts[i][1], ["-c", "copy", "-avoid_negative_ts", "make_zero",
+                                                                 "-movflags", "+faststart"], outputs[i])
+                for i in copies]
+        if not all(ffmpeg_pool.run(cmds, failures, progress_callback=phase(0.0, split))):
+            return False
+
+    # The byte index is an estimate: copied parts that came out too large are re-encoded too
+    encode = [i for i, p in enumerate(parts) if p[2] == ENCODE]
+    for i in copies:
+        size = os.path.getsize(outputs[i])
+        if size > profile.max_bytes and not profile.is_copy:
+            log_callback(f"⚖️ Part {i:03d} is {size / 1e6:.1f} MB, re-encoding to fit")
+            encode.append(i)
+        elif size > profile.max_bytes:
+            log_callback(f"⚠️ Part {i:03d} is {size / 1e6:.1f} MB (over budget; copy-only profile)")
+    if not encode:
+        if progress_callback:
+            progress_callback(1.0)
+        return True
+
+    work = tempfile.mkdtemp(prefix=".profile_", dir=folder)
+    try:
+        jobs = [(i, parts[i][0], parts[i][1], outputs[i]) for i in sorted(encode)]
+        log_callback(f"🔧 Re-encoding {len(jobs)} part(s) with {profile.vcodec} ({profile.preset})...")
+        if not _encode(video_path, jobs, profile, work, log_callback, phase(split if copies else 0.0, 1.0)):
+            return False
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    for i, *_ in jobs:
+        size = os.path.getsize(outputs[i])
+        if size > profile.max_bytes:
+            log_callback(f"⚠️ Part {i:03d} is still {size / 1e6:.1f} MB after re-encoding")
+    return True
@@ -0,0 +1,81 @@
+# clipops/startup.py
+
+"""
+Cold-start helpers: phase timing, an import-time breakdown and background
+pre-warming of the heavy dependencies once the window is up.
+Keep this module cheap to import; main.py loads it before anything else.
+"""
+
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
+
+class StartupTimer:
+    """Records named phases relative to process start (or `t0`)."""
+
+    def __init__(self, t0=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.t0))
+
+    def report(self):
+        lines, previous = [], 0.0
+        for name, at in self.marks:
+            lines.append(f"{name:<20} {at * 1000:8.1f} ms  (+{(at - previous) * 1000:.1f})")
+            previous = at
+        return lines
+
+
+def import_breakdown(module="clipops.controller", top=15):
+    """
+    Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+    returns the `top` slowest imports as (cumulative_ms, self_ms, name).
+    Empty in the frozen .exe, which cannot run arbitrary -c code.
+    """
+    if getattr(sys, "frozen", False):
+        return []
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except (ValueError, IndexError):
+            continue  # Header line
+        rows.append((cumulative_us / 1000, self_us / 1000, parts[2].strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def prewarm(modules, log_callback=None, model_name=None):
+    """
+    Imports `modules` (missing optional ones are skipped) and optionally loads a
+    Whisper model, on a daemon thread, so the first operation does not pay for it.
+    """
+    def run():
+        t0 = time.perf_counter()
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+        if model_name:
+            from .config import WHISPER_DEVICE, WHISPER_DTYPE
+            from .registry import registry
+            try:
+                registry.get(model_name, WHISPER_DEVICE, WHISPER_DTYPE)
+            except Exception:
+                pass  # Loaded (and reported) again on first use
+        if log_callback:
+            log_callback(f"🔥 Pre-warmed in {time.perf_counter() - t0:.1f}s")
+
+    thread = threading.Thread(target=run, daemon=True, name="clipops-prewarm")
+    thread.start()
+    return thread
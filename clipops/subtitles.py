@@ -0,0 +1,199 @@
+# clipops/subtitles.py
+
+import json
+import math
+import os
+from .transcript import Segment, iter_segments, count_segments
+from .utils import seconds_to_vtt_fmt, ProgressThrottle
+
+FORMATS = ("vtt", "srt", "ass", "json")
+
+
+# --- Writers ---
+class _Writer:
+    ext = ""
+
+    def __init__(self, f):
+        self.f = f
+
+    def header(self):
+        pass
+
+    def cue(self, index, start, end, text):
+        raise NotImplementedError
+
+    def footer(self):
+        pass
+
+
+class VttWriter(_Writer):
+    ext = "vtt"
+
+    def header(self):
+        self.f.write("WEBVTT\n\n")
+
+    def cue(self, index, start, end, text):
+        self.f.write(f"{seconds_to_vtt_fmt(start)} --> {seconds_to_vtt_fmt(end)}\n{text}\n\n")
+
+
+class SrtWriter(_Writer):
+    ext = "srt"
+
+    def cue(self, index, start, end, text):
+        self.f.write(f"{index}\n{seconds_to_vtt_fmt(start, ',')} --> {seconds_to_vtt_fmt(end, ',')}\n{text}\n\n")
+
+
+class AssWriter(_Writer):
+    ext = "ass"
+
+    def header(self):
+        self.f.write(
+            "[Script Info]\nScriptType: v4.00+\nPlayResX: 1920\nPlayResY: 1080\nWrapStyle: 0\n\n"
+            "[V4+ Styles]\n"
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+            "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+            "Style: Default,Arial,56,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,"
+            "0,0,0,0,100,100,0,0,1,3,1,2,60,60,50,1\n\n"
+            "[Events]\nFormat: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        )
+
+    @staticmethod
+    def _ts(seconds):
+        cs = int(round(seconds * 100))
+        s, cs = divmod(cs, 100)
+        m, s = divmod(s, 60)
+        h, m = divmod(m, 60)
+        return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+    def cue(self, index, start, end, text):
+        text = text.replace("\n", "\\N").replace("{", "(").replace("}", ")")
+        self.f.write(f"Dialogue: 0,{self._ts(start)},{self._ts(end)},Default,,0,0,0,,{text}\n")
+
+
+class JsonWriter(_Writer):
+    ext = "json"
+
+    def header(self):
+        self.f.write("[\n")
+
+    def cue(self, index, start, end, text):
+        sep = ",\n" if index > 1 else ""
+        self.f.write(sep + json.dumps({"index": index, "start": round(start, 3), "end": round(end, 3),
+                                       "text": text}, ensure_ascii=False))
+
+    def footer(self):
+        self.f.write("\n]\n")
+
+
+WRITERS = {w.ext: w for w in (VttWriter, SrtWriter, AssWriter, JsonWriter)}
+
+
+# --- Re-segmentation ---
+def _split_text(text, max_chars):
+    """Greedy word wrap into chunks of at most max_chars (long single words stay whole)."""
+    chunks, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            chunks.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        chunks.append(current)
+    return chunks or [text]
+
+
+def _split_by_words(seg, max_chars, max_duration):
+    group, start = [], None
+    for w in seg.words:
+        text = " ".join(x.text.strip() for x in group + [w])
+        too_long = max_chars and len(text) > max_chars
+        too_slow = max_duration and start is not None and w.end - start > max_duration
+        if group and (too_long or too_slow):
+            yield Segment(start, group[-1].end, " ".join(x.text.strip() for x in group), ())
+            group, start = [], None
+        if start is None:
+            start = w.start
+        group.append(w)
+    if group:
+        yield Segment(start, group[-1].end, " ".join(x.text.strip() for x in group), ())
+
+
+def resegment(segments, max_chars=None, max_duration=None):
+    """
+    Splits cues longer than `max_chars` characters or `max_duration` seconds.
+    Uses word timings when present; otherwise wraps text at word boundaries and
+    shares the segment's time between pieces in proportion to their length.
+    """
+    for seg in segments:
+        too_long = max_chars and len(seg.text) > max_chars
+        too_slow = max_duration and seg.end - seg.start > max_duration
+        if not (too_long or too_slow):
+            yield seg
+            continue
+        if seg.words:
+            yield from _split_by_words(seg, max_chars, max_duration)
+            continue
+
+        chars = max_chars or len(seg.text)
+        if too_slow:
+            pieces = math.ceil((seg.end - seg.start) / max_duration)
+            chars = min(chars, max(1, math.ceil(len(seg.text) / pieces)))
+        chunks = _split_text(seg.text, chars)
+        total = sum(len(c) for c in chunks) or 1
+        t = seg.start
+        for c in chunks:
+            end = t + (seg.end - seg.start) * len(c) / total
+            yield Segment(t, end, c, ())
+            t = end
+
+
+# --- Export ---
+def export_subtitles(source, formats, output_base=None, progress_callback=None, max_chars=None, max_duration=None):
+    """
+    Writes every requested format from one streaming pass over the transcript.
+    `source` is a transcript path (.txt or sidecar); returns the written paths.
+    """
+    formats = [f.lower() for f in formats]
+    unknown = [f for f in formats if f not in WRITERS]
+    if unknown:
+        raise ValueError(f"Unsupported subtitle format(s): {', '.join(unknown)}")
+
+    output_base = output_base or os.path.splitext(source)[0].replace(".segments", "")
+    total = count_segments(source)
+    progress = ProgressThrottle(progress_callback)
+
+    files, writers = [], []
+    try:
+        for fmt in formats:
+            path = f"{output_base}.{fmt}"
+            f = open(path, "w", encoding="utf-8")
+            files.append((path, f))
+            writers.append(WRITERS[fmt](f))
+        for w in writers:
+            w.header()
+
+        # Progress follows source segments, not the (possibly split) cues
+        seen = [0]
+
+        def counted(segments):
+            for seg in segments:
+                seen[0] += 1
+                yield seg
+
+        for index, seg in enumerate(resegment(counted(iter_segments(source)), max_chars, max_duration), 1):
+            text = seg.text.strip()
+            for w in writers:
+                w.cue(index, seg.start, seg.end, text)
+            if total:
+                progress(seen[0] / total)
+
+        for w in writers:
+            w.footer()
+    finally:
+        for _, f in files:
+            f.close()
+
+    progress(1.0)
+    return [path for path, _ in files]
@@ -0,0 +1,191 @@
+# clipops/tasks.py
+
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from .config import TASK_WORKERS, TASK_HISTORY
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class TaskCancelled(BaseException):
+    """
+    Raised inside a task once it is cancelled.
+    Derives from BaseException (like KeyboardInterrupt) so the model's
+    `except Exception` handlers do not swallow it and report a failure.
+    """
+
+
+class Task:
+    def __init__(self, task_id, name):
+        self.id = task_id
+        self.name = name
+        self.state = QUEUED
+        self.progress = None      # None = indeterminate
+        self.created = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.future = None
+        self._cancel = threading.Event()
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def add_process(self, process):
+        with self._lock:
+            self._processes.add(process)
+        if self.cancelled:
+            process.kill()
+
+    def cancel(self):
+        self._cancel.set()
+        with self._lock:
+            for p in self._processes:
+                if p.poll() is None:
+                    p.kill()
+
+    def snapshot(self):
+        return {"id": self.id, "name": self.name, "state": self.state, "progress": self.progress,
+                "elapsed": round(self.elapsed, 1)}
+
+
+# --- Current task (thread-local) ---
+_local = threading.local()
+
+
+def current_task():
+    return getattr(_local, "task", None)
+
+
+@contextmanager
+def task_context(task):
+    """Binds `task` to this thread, e.g. inside worker-pool threads started by the task."""
+    previous = current_task()
+    _local.task = task
+    try:
+        yield task
+    finally:
+        _local.task = previous
+
+
+def check_cancelled():
+    """Cancellation point for long Python loops (Whisper chunks, translation batches)."""
+    task = current_task()
+    if task is not None and task.cancelled:
+        raise TaskCancelled()
+
+
+def register_process(process):
+    """Lets the current task kill this subprocess when it is cancelled."""
+    task = current_task()
+    if task is not None:
+        task.add_process(process)
+
+
+class TaskManager:
+    """
+    Runs operations on a bounded thread pool and tracks each one as a Task
+    (id, state, progress, elapsed). Logs and progress are buffered here; the
+    UI polls `drain_logs()` / `snapshot()` from a single periodic tick instead
+    of scheduling one Tk callback per message.
+    """
+
+    def __init__(self, max_workers=TASK_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="clipops-task")
+        self._ids = itertools.count(1)
+        self._tasks = {}
+        self._logs = deque()
+        self._finished = deque()
+        self._lock = threading.Lock()
+
+    def submit(self, name, fn, *args, determinate=False, **kwargs):
+        """Queues fn(*args, log_callback=..., [progress_callback=...], **kwargs)."""
+        task = Task(next(self._ids), name)
+        if determinate:
+            task.progress = 0.0
+            kwargs["progress_callback"] = lambda v: setattr(task, "progress", v)
+        kwargs["log_callback"] = lambda msg: self._logs.append(f"[#{task.id}] {msg}")
+
+        def run():
+            if task.cancelled:
+                return self._finish(task, CANCELLED)
+            task.state, task.started = RUNNING, time.monotonic()
+            with task_context(task):
+                try:
+                    ok = fn(*args, **kwargs)
+                    state = CANCELLED if task.cancelled else (DONE if ok else FAILED)
+                except TaskCancelled:
+                    state = CANCELLED
+                except Exception as e:
+                    self._logs.append(f"[#{task.id}] ❌ Error: {e}")
+                    state = FAILED
+            self._finish(task, state)
+
+        with self._lock:
+            self._tasks[task.id] = task
+            self._trim()
+        task.future = self._pool.submit(run)
+        return task
+
+    def _finish(self, task, state):
+        task.state, task.finished = state, time.monotonic()
+        if task.progress is not None and state == DONE:
+            task.progress = 1.0
+        if state == CANCELLED:
+            self._logs.append(f"[#{task.id}] 🛑 Cancelled")
+        self._finished.append(task.snapshot())
+
+    def _trim(self):
+        finished = [t for t in self._tasks.values() if t.state in (DONE, FAILED, CANCELLED)]
+        for t in finished[:max(0, len(finished) - TASK_HISTORY)]:
+            del self._tasks[t.id]
+
+    def cancel(self, task_id):
+        task = self._tasks.get(task_id)
+        if task is None or task.state in (DONE, FAILED, CANCELLED):
+            return False
+        task.cancel()
+        if task.future is not None and task.future.cancel():
+            self._finish(task, CANCELLED)  # Never started
+        return True
+
+    def log(self, msg):
+        """Queues a message for the UI from any thread."""
+        self._logs.append(msg)
+
+    # --- Polled by the UI ---
+    def snapshot(self):
+        with self._lock:
+            return [t.snapshot() for t in self._tasks.values()]
+
+    def drain_logs(self):
+        out = []
+        while self._logs:
+            out.append(self._logs.popleft())
+        return out
+
+    def drain_finished(self):
+        out = []
+        while self._finished:
+            out.append(self._finished.popleft())
+        return out
+
+    def running(self):
+        return [t for t in self._tasks.values() if t.state in (QUEUED, RUNNING)]
+
+    def shutdown(self):
+        for t in self.running():
+            t.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
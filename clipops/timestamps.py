@@ -0,0 +1,113 @@
+# clipops/timestamps.py
+
+"""
+Timestamp and topic-list parsing.
+Every topic line is parsed, range-checked against the media duration and
+de-overlapped here, before any ffmpeg process is started. Problems are
+returned as issues (rejected lines, or repairs when repair=True) rather than
+surfacing later as failed cuts.
+"""
+
+import re
+from collections import namedtuple
+
+# HH:MM:SS(.mmm), MM:SS(.mmm) or plain seconds; ',' is accepted as the decimal mark (SRT style)
+_TS = r"\d+(?::\d{1,2}){0,2}(?:[.,]\d+)?"
+TIMESTAMP_RE = re.compile(rf"^\s*({_TS})\s*$")
+LINE_RE = re.compile(
+    rf"^\s*(?:[-*•]\s+)?(?P<start>{_TS})(?:\s*(?:-+|–|—|→|to)\s*|\s+)(?P<end>{_TS})\s*(?:[:|\-–—]\s*)?(?P<title>.*?)\s*$",
+    re.IGNORECASE,
+)
+_UNSAFE = re.compile(r'[<>:"/\\|?*\x00-\x1f]+')
+
+Topic = namedtuple("Topic", "start end title line")
+Issue = namedtuple("Issue", "line text message repaired")
+
+
+def _seconds(token):
+    """Converts a token already matched by _TS; checks the 0-59 fields."""
+    parts = token.replace(",", ".").split(":")
+    total = 0.0
+    for i, p in enumerate(parts):
+        v = float(p)
+        if i and v >= 60:
+            raise ValueError(f"Invalid timestamp: {token!r} (minutes/seconds must be below 60)")
+        total = total * 60 + v
+    return total
+
+
+def parse(value):
+    """'01:02:03.5', '62:03', '3723.5' -> float seconds. Raises ValueError when malformed."""
+    match = TIMESTAMP_RE.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    return _seconds(match.group(1))
+
+
+def safe_title(title, number):
+    """File-name safe title; empty titles become Topic_<n>."""
+    title = _UNSAFE.sub("-", title.strip()).replace(" ", "_").strip("._-")
+    return title or f"Topic_{number}"
+
+
+def parse_topics(text, duration=None, repair=True, min_length=0.5):
+    """
+    Parses 'START - END : Title' lines into non-overlapping Topics, kept in
+    input order (clip numbers follow the list, not the start times).
+    With repair=True, ends past the media duration are clamped, partial
+    overlaps are trimmed and topics inside another one are merged into it;
+    with repair=False those lines are rejected. Returns (topics, issues).
+    """
+    topics, issues = [], []
+    for number, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = LINE_RE.match(line)
+        if not match:
+            issues.append(Issue(number, line, "not a 'START - END : Title' line", False))
+            continue
+        try:
+            start, end = _seconds(match.group("start")), _seconds(match.group("end"))
+        except ValueError as e:
+            issues.append(Issue(number, line, str(e), False))
+            continue
+
+        if duration:
+            if start >= duration:
+                issues.append(Issue(number, line, "starts after the end of the video", False))
+                continue
+            if end > duration:
+                if not repair:
+                    issues.append(Issue(number, line, "ends after the end of the video", False))
+                    continue
+                issues.append(Issue(number, line, f"end clamped to {duration:.3f}s", True))
+                end = duration
+        if end - start < min_length:
+            issues.append(Issue(number, line, "end is not after start", False))
+            continue
+        topics.append(Topic(start, end, match.group("title"), number))
+
+    topics.sort(key=lambda t: (t.start, -t.end))
+    result = []
+    for t in topics:
+        if not result or t.start >= result[-1].end:
+            result.append(t)
+            continue
+        prev = result[-1]
+        if not repair:
+            issues.append(Issue(t.line, t.title, f"overlaps line {prev.line}", False))
+        elif t.end <= prev.end:
+            issues.append(Issue(t.line, t.title, f"inside line {prev.line}; merged into it", True))
+        elif t.start - prev.start >= min_length:
+            issues.append(Issue(prev.line, prev.title, f"trimmed to end where line {t.line} starts", True))
+            result[-1] = prev._replace(end=t.start)
+            result.append(t)
+        else:
+            # Same start, longer end: keep the longer range under the first title
+            issues.append(Issue(t.line, t.title, f"same start as line {prev.line}; merged into it", True))
+            result[-1] = prev._replace(end=t.end)
+
+    result.sort(key=lambda t: t.line)
+    issues.sort(key=lambda i: i.line)
+    return [t._replace(title=safe_title(t.title, n)) for n, t in enumerate(result, 1)], issues
@@ -0,0 +1,188 @@
+# clipops/tracing.py
+
+"""
+Lightweight tracing for the model layer.
+
+    CLIPOPS_TRACE=traces python main.py     # spans -> traces/trace-<pid>.json (chrome://tracing, Perfetto)
+                                            # totals -> traces/metrics-<pid>.prom (Prometheus text format)
+    CLIPOPS_PROFILE=profiles python main.py  # one cProfile .prof per outermost traced operation
+
+Spans record wall time plus attributes (bytes read/written, counts); counters
+accumulate totals such as subprocesses spawned. With neither variable set,
+`span()` returns a shared no-op object and `traced` adds one attribute check.
+py-spy needs no hook: attach it to the process (worker threads are named).
+"""
+
+import atexit
+import cProfile
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "cat", "attrs", "start", "end", "tid")
+
+    def __init__(self, tracer, name, cat, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.attrs = attrs
+        self.start = self.end = 0
+        self.tid = threading.get_ident()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._finish(self)
+        return False
+
+
+class Tracer:
+    """Collects spans and counters in memory; export with chrome_trace() / prometheus()."""
+
+    def __init__(self, enabled=False, profile_dir=None):
+        self.enabled = enabled
+        self.profile_dir = profile_dir
+        self.spans = []
+        self.counters = defaultdict(float)
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._profiles = itertools.count(1)
+        self._profiling = threading.Lock()  # Held while a cProfile run is active
+
+    def span(self, name, cat="model", **attrs):
+        return Span(self, name, cat, attrs) if self.enabled else _NULL
+
+    def count(self, name, value=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += value
+
+    def _finish(self, span):
+        with self._lock:
+            self.spans.append(span)
+            self._threads.setdefault(span.tid, threading.current_thread().name)
+            for key in ("bytes_read", "bytes_written"):
+                if key in span.attrs:
+                    self.counters[key] += span.attrs[key] or 0
+
+    # --- Export ---
+    def chrome_trace(self):
+        """Trace Event Format ('X' complete events), loadable in chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        with self._lock:
+            spans, threads = list(self.spans), dict(self._threads)
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in threads.items()]
+        for s in spans:
+            events.append({"name": s.name, "cat": s.cat, "ph": "X", "pid": pid, "tid": s.tid,
+                           "ts": (s.start - self._origin) / 1000, "dur": (s.end - s.start) / 1000,
+                           "args": {k: v for k, v in s.attrs.items() if isinstance(v, (int, float, str, bool))}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def prometheus(self):
+        """Per-span totals and counters in the Prometheus text exposition format."""
+        seconds, calls = defaultdict(float), defaultdict(int)
+        with self._lock:
+            for s in self.spans:
+                seconds[(s.cat, s.name)] += (s.end - s.start) / 1e9
+                calls[(s.cat, s.name)] += 1
+            counters = dict(self.counters)
+
+        lines = ["# HELP clipops_span_seconds_total Wall time spent in each traced stage.",
+                 "# TYPE clipops_span_seconds_total counter"]
+        lines += [f'clipops_span_seconds_total{{cat="{c}",name="{n}"}} {v:.6f}' for (c, n), v in sorted(seconds.items())]
+        lines += ["# HELP clipops_span_calls_total Number of times each stage ran.",
+                  "# TYPE clipops_span_calls_total counter"]
+        lines += [f'clipops_span_calls_total{{cat="{c}",name="{n}"}} {v}' for (c, n), v in sorted(calls.items())]
+        for name, value in sorted(counters.items()):
+            lines += [f"# TYPE clipops_{name}_total counter", f"clipops_{name}_total {value:g}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, folder):
+        """Writes trace-<pid>.json and metrics-<pid>.prom to `folder`; returns both paths."""
+        os.makedirs(folder, exist_ok=True)
+        trace = os.path.join(folder, f"trace-{os.getpid()}.json")
+        metrics = os.path.join(folder, f"metrics-{os.getpid()}.prom")
+        with open(trace, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        with open(metrics, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        return trace, metrics
+
+    # --- Profiling ---
+    def _profiled(self, name, fn, args, kwargs):
+        """Profiles only the outermost traced call: one profiler may be active per process
+        (3.12+ raises otherwise), and nested or parallel calls show up in its stats."""
+        if not self._profiling.acquire(blocking=False):
+            return fn(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn, *args, **kwargs)
+        finally:
+            self._profiling.release()
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, f"{name}-{os.getpid()}-{next(self._profiles)}.prof"))
+
+
+def _env_dir(var, default):
+    value = os.environ.get(var, "").strip()
+    if not value or value.lower() in ("0", "false", "no"):
+        return None
+    return default if value.lower() in ("1", "true", "yes") else value
+
+
+_TRACE_DIR = _env_dir("CLIPOPS_TRACE", "clipops_traces")
+tracer = Tracer(enabled=bool(_TRACE_DIR), profile_dir=_env_dir("CLIPOPS_PROFILE", "clipops_profiles"))
+if _TRACE_DIR:
+    atexit.register(tracer.export, _TRACE_DIR)
+
+
+def span(name, cat="model", **attrs):
+    """Context manager timing one stage (a no-op unless tracing is enabled)."""
+    return tracer.span(name, cat, **attrs)
+
+
+def traced(name, cat="model"):
+    """Decorator: wraps each call in a span (and a cProfile run when CLIPOPS_PROFILE is set)."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled and not tracer.profile_dir:
+                return fn(*args, **kwargs)
+            with tracer.span(name, cat):
+                if tracer.profile_dir:
+                    return tracer._profiled(name, fn, args, kwargs)
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,261 @@
+# clipops/transcript.py
+
+import json
+import os
+import re
+from array import array
+from collections import namedtuple
+
+FORMAT = "clipops-transcript"
+VERSION = 1
+
+# Legacy "[12s - 15s]: text" lines written by older versions (and still exported)
+_TXT_LINE = re.compile(r"\[(\d+(?:\.\d+)?)s\s*-\s*(\d+(?:\.\d+)?)s\]:\s*(.*)")
+# Any other "[label]: text" line, e.g. "[Speaker 1]: hi"
+_LABEL_LINE = re.compile(r"(\[.*?\]):\s*(.*)")
+
+Segment = namedtuple("Segment", "start end text words")
+Word = namedtuple("Word", "start end text probability")
+
+
+def sidecar_path(path):
+    """'talk_transcript.txt' -> 'talk_transcript.segments.jsonl'."""
+    if path.endswith(".segments.jsonl"):
+        return path
+    return f"{os.path.splitext(path)[0]}.segments.jsonl"
+
+
+class Transcript:
+    """
+    Compact, array-backed transcript.
+    Segment times live in float arrays and all segment text in one string buffer
+    addressed by offsets, so long transcripts cost a few bytes per segment instead
+    of a dict each. Word-level timings are optional and stored the same way.
+    Lines of a .txt that are not '[Ns - Ms]: text' (headers, hand-written notes)
+    are kept in `raw` as (segment position, line) and written back verbatim.
+    """
+
+    def __init__(self, language=None):
+        self.language = language
+        self.starts = array("d")
+        self.ends = array("d")
+        self._text_parts = []
+        self._text_offsets = array("q", [0])
+        self._text = None
+
+        self.word_starts = array("d")
+        self.word_ends = array("d")
+        self.word_probs = array("f")
+        self._word_parts = []
+        self._word_text_offsets = array("q", [0])
+        self._word_index = array("q", [0])   # segment i owns words [_word_index[i], _word_index[i+1])
+        self._word_text = None
+        self.raw = []   # (number of segments before the line, line)
+
+    # --- Building ---
+    def append(self, start, end, text, words=None):
+        text = text.strip()
+        self.starts.append(float(start))
+        self.ends.append(float(end))
+        self._text_parts.append(text)
+        self._text_offsets.append(self._text_offsets[-1] + len(text))
+        self._text = None
+
+        for w in words or ():
+            self.word_starts.append(float(w[0]))
+            self.word_ends.append(float(w[1]))
+            self._word_parts.append(w[2])
+            self._word_text_offsets.append(self._word_text_offsets[-1] + len(w[2]))
+            self.word_probs.append(float(w[3]) if len(w) > 3 and w[3] is not None else 1.0)
+        self._word_index.append(len(self.word_starts))
+        self._word_text = None
+
+    @classmethod
+    def from_whisper(cls, result):
+        t = cls(language=result.get("language"))
+        for seg in result.get("segments", []):
+            words = [(w["start"], w["end"], w["word"], w.get("probability")) for w in seg.get("words") or ()]
+            t.append(seg["start"], seg["end"], seg["text"], words)
+        return t
+
+    @classmethod
+    def from_segments(cls, segments, language=None):
+        """Builds from Segments; plain strings in `segments` (see iter_entries) are kept as raw lines."""
+        t = cls(language=language)
+        for seg in segments:
+            if isinstance(seg, str):
+                t.raw.append((len(t), seg))
+            else:
+                t.append(seg.start, seg.end, seg.text, seg.words)
+        return t
+
+    def entries(self):
+        """Segments and raw lines in file order."""
+        raw = iter(self.raw)
+        pending = next(raw, None)
+        for i in range(len(self) + 1):
+            while pending is not None and pending[0] <= i:
+                yield pending[1]
+                pending = next(raw, None)
+            if i < len(self):
+                yield self[i]
+
+    # --- Access ---
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def has_words(self):
+        return len(self.word_starts) > 0
+
+    def text(self, i):
+        if self._text is None:
+            self._text = "".join(self._text_parts)
+            self._text_parts = [self._text]
+        return self._text[self._text_offsets[i]:self._text_offsets[i + 1]]
+
+    def words(self, i):
+        lo, hi = self._word_index[i], self._word_index[i + 1]
+        if lo == hi:
+            return ()
+        if self._word_text is None:
+            self._word_text = "".join(self._word_parts)
+            self._word_parts = [self._word_text]
+        off = self._word_text_offsets
+        return tuple(
+            Word(self.word_starts[j], self.word_ends[j], self._word_text[off[j]:off[j + 1]], self.word_probs[j])
+            for j in range(lo, hi)
+        )
+
+    def __getitem__(self, i):
+        return Segment(self.starts[i], self.ends[i], self.text(i), self.words(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def duration(self):
+        return self.ends[-1] if len(self) else 0.0
+
+    # --- Serialization ---
+    def save(self, path):
+        """Writes the JSONL sidecar: a header line, then one compact line per segment (or raw line)."""
+        path = sidecar_path(path)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"format": FORMAT, "version": VERSION, "count": len(self),
+                                "language": self.language}) + "\n")
+            for seg in self.entries():
+                if isinstance(seg, str):
+                    f.write(json.dumps({"raw": seg}, ensure_ascii=False) + "\n")
+                    continue
+                rec = {"s": round(seg.start, 3), "e": round(seg.end, 3), "t": seg.text}
+                if seg.words:
+                    rec["w"] = [[round(w.start, 3), round(w.end, 3), w.text, round(w.probability, 4)]
+                                for w in seg.words]
+                f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp, path)
+        return path
+
+    def write_txt(self, path):
+        """Legacy '[Ns - Ms]: text' export; raw lines are written back verbatim."""
+        with open(path, "w", encoding="utf-8") as f:
+            for seg in self.entries():
+                f.write(f"{seg}\n" if isinstance(seg, str) else format_txt_line(seg))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        header = read_header(path)
+        return cls.from_segments(iter_entries(path), language=header.get("language") if header else None)
+
+
+def format_txt_line(seg):
+    return f"[{int(seg.start)}s - {int(seg.end)}s]: {seg.text}\n"
+
+
+def split_label(line):
+    """'[Speaker 1]: hi' -> ('[Speaker 1]', 'hi'); None for lines without a bracketed prefix."""
+    m = _LABEL_LINE.match(line)
+    return (m.group(1), m.group(2).strip()) if m else None
+
+
+def _sidecar_if_current(path):
+    """The sidecar for `path`, unless missing or older than a hand-edited .txt."""
+    sidecar = sidecar_path(path)
+    if not os.path.exists(sidecar):
+        return None
+    if sidecar != path and os.path.exists(path) and os.path.getmtime(path) > os.path.getmtime(sidecar):
+        return None
+    return sidecar
+
+
+def read_header(path):
+    """Header dict of the sidecar for `path`, or None when only a legacy .txt exists."""
+    sidecar = _sidecar_if_current(path)
+    if not sidecar:
+        return None
+    with open(sidecar, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+    return header if header.get("format") == FORMAT else None
+
+
+def iter_entries(path):
+    """
+    Streams a transcript without loading it whole: a Segment per timed line and
+    the line itself (str, no newline) for anything else.
+    Prefers the JSONL sidecar next to `path`; falls back to parsing the .txt
+    when there is no sidecar or the .txt was edited after it was written.
+    """
+    sidecar = _sidecar_if_current(path)
+    if sidecar:
+        with open(sidecar, "r", encoding="utf-8") as f:
+            f.readline()  # header
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                if "raw" in rec:
+                    yield rec["raw"]
+                    continue
+                words = tuple(Word(*w) for w in rec.get("w", ()))
+                yield Segment(rec["s"], rec["e"], rec["t"], words)
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            m = _TXT_LINE.match(line)
+            if m:
+                yield Segment(float(m.group(1)), float(m.group(2)), m.group(3).strip(), ())
+            else:
+                yield line.rstrip("\r\n")
+
+
+def iter_segments(path):
+    """
+    Streams Segments (see iter_entries). Untimed text after a segment is
+    appended to it, so hand-edited continuation lines are not lost, except
+    "[label]: text" lines, which become their own cue over the same time;
+    untimed lines before the first segment (headers) are skipped.
+    """
+    previous = None
+    for entry in iter_entries(path):
+        if isinstance(entry, str):
+            if previous is not None and split_label(entry):
+                yield previous
+                previous = Segment(previous.start, previous.end, entry.strip(), ())
+            elif previous is not None and entry.strip():
+                previous = previous._replace(text=f"{previous.text} {entry.strip()}".strip())
+            continue
+        if previous is not None:
+            yield previous
+        previous = entry
+    if previous is not None:
+        yield previous
+
+
+def count_segments(path):
+    """Segment count from the sidecar header (cheap), or None if unknown."""
+    header = read_header(path)
+    return header.get("count") if header else None
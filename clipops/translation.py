@@ -0,0 +1,122 @@
+# clipops/translation.py
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .tasks import current_task, check_cancelled
+from .tracing import span
+from .config import TRANSLATE_BATCH_CHARS, TRANSLATE_WORKERS, TRANSLATE_RETRIES, TRANSLATE_BACKOFF
+
+_SEPARATOR = "\n"
+
+
+class GoogleBackend:
+    """
+    deep-translator's GoogleTranslator behind the backend interface.
+    A batch is sent as one newline-joined request; if the service merges or
+    splits lines, the batch is retried line by line so alignment is never lost.
+    """
+
+    name = "google"
+
+    def __init__(self, target, source="auto"):
+        from deep_translator import GoogleTranslator
+        self.source = source
+        self.target = target
+        self._translator = GoogleTranslator(source=source, target=target)
+
+    def translate_batch(self, texts):
+        if len(texts) > 1:
+            parts = self._translator.translate(_SEPARATOR.join(texts)).split(_SEPARATOR)
+            if len(parts) == len(texts):
+                return [p.strip() for p in parts]
+        return [self._translator.translate(t) for t in texts]
+
+
+class TranslationPipeline:
+    """
+    Translates a list of strings with as few backend calls as possible:
+    identical strings are translated once, unique strings are packed into
+    batches up to `batch_chars`, and batches run concurrently with retry and
+    exponential backoff. Results come back in input order (None = failed).
+    With a TranslationMemory, remembered strings never reach the backend.
+
+    Any object with `name` and `translate_batch(list) -> list` can be a backend;
+    optional `source` / `target` attributes become part of the memory key.
+    """
+
+    def __init__(self, backend, memory=None, batch_chars=TRANSLATE_BATCH_CHARS, workers=TRANSLATE_WORKERS,
+                 retries=TRANSLATE_RETRIES, backoff=TRANSLATE_BACKOFF):
+        self.backend = backend
+        self.memory = memory
+        self.batch_chars = batch_chars
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.calls = 0
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self._lock = threading.Lock()
+
+    def make_batches(self, texts):
+        batches, current, size = [], [], 0
+        for text in texts:
+            cost = len(text) + len(_SEPARATOR)
+            if current and size + cost > self.batch_chars:
+                batches.append(current)
+                current, size = [], 0
+            current.append(text)
+            size += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _call(self, batch):
+        for attempt in range(self.retries + 1):
+            try:
+                with self._lock:
+                    self.calls += 1
+                with span("translate.batch", "translate", lines=len(batch), chars=sum(map(len, batch)),
+                          attempt=attempt):
+                    result = self.backend.translate_batch(batch)
+                if len(result) != len(batch):
+                    raise ValueError("Backend returned a different number of lines")
+                return result
+            except Exception:
+                if attempt == self.retries:
+                    return [None] * len(batch)
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random() * 0.25))
+
+    def translate(self, texts, progress_callback=None):
+        # Newlines would break batch alignment; transcript segments are single-line anyway
+        cleaned = [" ".join(t.split()) for t in texts]
+        unique = list(dict.fromkeys(t for t in cleaned if t))
+
+        key = (getattr(self.backend, "source", "auto"), getattr(self.backend, "target", ""), self.backend.name)
+        translated = self.memory.lookup(unique, *key) if self.memory else {}
+        pending = [t for t in unique if t not in translated]
+        self.memory_hits += len(translated)
+        self.memory_misses += len(pending)
+        batches = self.make_batches(pending)
+
+        done = len(translated)
+        fresh = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._call, b): b for b in batches}
+            task = current_task()
+            for future in as_completed(futures):
+                if task is not None and task.cancelled:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+                batch = futures[future]
+                fresh.update(zip(batch, future.result()))
+                done += len(batch)
+                if progress_callback:
+                    progress_callback(done / len(unique))
+
+        if self.memory:
+            self.memory.store(fresh, *key)  # Keeps finished batches even when cancelled
+        check_cancelled()
+        translated.update(fresh)
+        return [translated.get(t) if t else t for t in cleaned]
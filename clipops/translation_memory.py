@@ -0,0 +1,86 @@
+# clipops/translation_memory.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from .config import TM_PATH, TM_MAX_ENTRIES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tm (
+    text_hash   TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    target      TEXT NOT NULL,
+    backend     TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    last_used   REAL NOT NULL,
+    PRIMARY KEY (text_hash, source, target, backend)
+);
+CREATE INDEX IF NOT EXISTS tm_last_used ON tm(last_used);
+"""
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """
+    On-disk (SQLite) cache of previous translations shared across runs.
+    Entries are keyed by (source text hash, source lang, target lang, backend);
+    once the table grows past `max_entries` the least recently used rows are dropped.
+    """
+
+    def __init__(self, path=TM_PATH, max_entries=TM_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def lookup(self, texts, source, target, backend):
+        """Returns {text: translation} for every text already in memory."""
+        hashes = {text_hash(t): t for t in texts}
+        found = {}
+        keys = list(hashes)
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT text_hash, translation FROM tm WHERE source=? AND target=? AND backend=? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [source, target, backend] + chunk,
+                ).fetchall()
+                found.update((hashes[h], tr) for h, tr in rows)
+            if found:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE tm SET last_used=? WHERE text_hash=? AND source=? AND target=? AND backend=?",
+                    [(now, text_hash(t), source, target, backend) for t in found],
+                )
+                self._db.commit()
+        return found
+
+    def store(self, pairs, source, target, backend):
+        """Saves {text: translation} pairs and enforces the size bound."""
+        now = time.time()
+        rows = [(text_hash(t), source, target, backend, tr, now) for t, tr in pairs.items() if tr]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO tm VALUES (?, ?, ?, ?, ?, ?)", rows)
+            count = self._db.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+            if count > self.max_entries:
+                # Trim to 90% so eviction does not run on every insert
+                excess = count - int(self.max_entries * 0.9)
+                self._db.execute(
+                    "DELETE FROM tm WHERE rowid IN (SELECT rowid FROM tm ORDER BY last_used LIMIT ?)", (excess,)
+                )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
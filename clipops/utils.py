@@ -1,15 +1,71 @@
 # clipops/utils.py
 
+import hashlib
 import os
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from .config import CACHE_DIR, FFMPEG_LOG_LINES
+from .tasks import current_task, register_process
+from .tracing import span, tracer
 
-def seconds_to_vtt_fmt(seconds):
-    """Converts seconds to HH:MM:SS.000 format."""
-    seconds = int(seconds)
-    m, s = divmod(seconds, 60)
+def seconds_to_vtt_fmt(seconds, sep="."):
+    """Converts seconds to HH:MM:SS.mmm format (sep="," gives SRT timestamps)."""
+    ms = int(round(float(seconds) * 1000))
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
     h, m = divmod(m, 60)
-    return f"{h:02d}:{m:02d}:{s:02d}.000"
+    return f"{h:02d}:{m:02d}:{s:02d}{sep}{ms:03d}"
+
+class ProgressThrottle:
+    """
+    Wraps a progress callback so it fires at most every `min_interval` seconds
+    or `min_step` of progress (and always at 100%). Keeps per-line loops from
+    flooding the Tk event queue with after() calls.
+    """
+
+    def __init__(self, callback, min_interval=0.1, min_step=0.01):
+        self.callback = callback
+        self.min_interval = min_interval
+        self.min_step = min_step
+        self._last_value = -1.0
+        self._last_time = 0.0
+
+    def __call__(self, value):
+        if not self.callback:
+            return
+        now = time.monotonic()
+        if (value >= 1.0 > self._last_value) or (value - self._last_value >= self.min_step and now - self._last_time >= self.min_interval):
+            self._last_value, self._last_time = value, now
+            self.callback(value)
+
+def parse_timestamp(value):
+    """Converts 'HH:MM:SS', 'MM:SS' or plain seconds (decimals allowed) to float seconds."""
+    total = 0.0
+    for part in str(value).strip().split(":"):
+        total = total * 60 + float(part or 0)
+    return total
+
+def file_fingerprint(path, sample_size=1024 * 1024):
+    """
+    Cheap content fingerprint for multi-GB media: size, mtime and a SHA-1 over
+    the first, middle and last `sample_size` bytes (plus the size itself).
+    """
+    st = os.stat(path)
+    h = hashlib.sha1(str(st.st_size).encode())
+    with open(path, "rb") as f:
+        for offset in (0, max(0, st.st_size // 2 - sample_size // 2), max(0, st.st_size - sample_size)):
+            f.seek(offset)
+            h.update(f.read(sample_size))
+    return {"size": st.st_size, "mtime": st.st_mtime, "hash": h.hexdigest()}
+
+def preview_folder(path):
+    """Preview asset folder for `path`, keyed by (path, size, mtime); see preview.py."""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return os.path.join(CACHE_DIR, "preview", hashlib.sha1(key.encode("utf-8")).hexdigest())
 
 def ensure_icon_exists(icon_path):
     """Generates the app icon if it doesn't exist."""
@@ -35,9 +91,9 @@ def ensure_icon_exists(icon_path):
         except Exception:
             pass
 
-def run_ffmpeg_command(cmd, log_callback):
+def resolve_tool(name):
     """
-    نسخة ذكية تحدد مسار FFmpeg سواء في وضع التطوير أو الـ EXE
+    نسخة ذكية تحدد مسار FFmpeg / FFprobe سواء في وضع التطوير أو الـ EXE
     """
     # 1. تحديد المسار الأساسي (Base Path)
     if getattr(sys, 'frozen', False):
@@ -46,25 +102,94 @@ def run_ffmpeg_command(cmd, log_callback):
     else:
         # لو البرنامج شغال كـ Python Script، المسار هو مكان الملف الحالي
         base_path = os.getcwd()
-    
-    # 2. تحديد مسار ffmpeg.exe المتوقع بجانب البرنامج
-    local_ffmpeg = os.path.join(base_path, "ffmpeg.exe")
-    
-    # 3. تعديل الأمر لاستخدام الملف المحلي لو موجود
-    if os.path.exists(local_ffmpeg):
-        cmd[0] = local_ffmpeg
-        # log_callback(f"🔧 Using bundled FFmpeg: {local_ffmpeg}") # (اختياري للتبع)
-    else:
-        # لو مش موجود، حاول تعتمد على الـ System Path (بس ده خطر في الـ exe)
-        cmd[0] = "ffmpeg"
+
+    # 2. تحديد مسار الأداة المتوقع بجانب البرنامج
+    local_tool = os.path.join(base_path, f"{name}.exe")
+
+    # 3. استخدام الملف المحلي لو موجود، وإلا الـ System Path (بس ده خطر في الـ exe)
+    return local_tool if os.path.exists(local_tool) else name
+
+def hidden_startupinfo():
+    """Hides the console window of child processes on Windows."""
+    if os.name != 'nt':
+        return None
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return startupinfo
+
+def low_priority_kwargs():
+    """Popen arguments that start a child below normal priority on Windows (POSIX: see lower_priority)."""
+    if os.name == 'nt':
+        return {"creationflags": subprocess.BELOW_NORMAL_PRIORITY_CLASS}
+    return {}
+
+def lower_priority(process):
+    """
+    Renices a started child on POSIX. Done from the parent rather than with
+    preexec_fn, which is unsafe when other threads are running (always, here).
+    """
+    if hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, process.pid, 10)
+        except OSError:
+            pass  # Already exited
+
+def probe_duration(path):
+    """Returns the container duration in seconds via ffprobe, or None if unknown."""
+    cmd = [resolve_tool("ffprobe"), "-v", "error", "-show_entries", "format=duration",
+           "-of", "default=noprint_wrappers=1:nokey=1", path]
+    try:
+        with span("probe.duration", "probe"):
+            out = subprocess.run(cmd, capture_output=True, text=True, startupinfo=hidden_startupinfo()).stdout
+        tracer.count("subprocesses")
+        return float(out.strip())
+    except (OSError, ValueError):
+        return None
+
+def _output_duration(cmd):
+    """Expected output length of an ffmpeg command: -t, else -to minus -ss, else the probed input."""
+    opts = dict(zip(cmd, cmd[1:]))
+    if "-t" in opts:
+        return parse_timestamp(opts["-t"])
+    if "-to" in opts:
+        return parse_timestamp(opts["-to"]) - parse_timestamp(opts.get("-ss", 0))
+    if "-i" in opts:
+        return probe_duration(opts["-i"])
+    return None
+
+def _fmt_eta(seconds):
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h}h {m:02d}m" if h else f"{m}m {s:02d}s"
+
+def run_ffmpeg_command(cmd, log_callback, on_start=None, progress_callback=None, duration=None, low_priority=False):
+    """
+    Runs ffmpeg and streams its progress instead of buffering all output.
+    `-progress pipe:1` reports out_time on stdout, which is turned into
+    progress_callback fractions (and ETA log lines) against `duration`
+    (derived from the command when omitted). stderr is kept in a bounded
+    ring buffer so multi-hour runs use constant memory.
+    on_start (optional) receives the Popen object so callers can kill it;
+    it is also registered with the current task so cancelling the task kills it.
+    low_priority runs ffmpeg below normal priority so it yields to interactive work.
+    """
+    trace = span("ffmpeg", "subprocess", output=os.path.basename(str(cmd[-1])))
+    if tracer.enabled:
+        inputs = [cmd[i + 1] for i, arg in enumerate(cmd[:-1]) if arg == "-i"]
+        trace.set(bytes_read=sum(os.path.getsize(p) for p in inputs if os.path.isfile(p)))
+    with trace:
+        return _run_ffmpeg(cmd, log_callback, on_start, progress_callback, duration, trace, low_priority)
+
+def _run_ffmpeg(cmd, log_callback, on_start, progress_callback, duration, trace, low_priority=False):
+    cmd[0] = resolve_tool("ffmpeg")
+    if "-progress" not in cmd:
+        cmd[1:1] = ["-hide_banner", "-nostats", "-progress", "pipe:1"]
+
+    if progress_callback and not duration:
+        duration = _output_duration(cmd)
 
     # 4. التنفيذ
     try:
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            
         process = subprocess.Popen(
             cmd, 
             stdout=subprocess.PIPE, 
@@ -72,17 +197,58 @@ def run_ffmpeg_command(cmd, log_callback):
             text=True, 
             encoding='utf-8', 
             errors='replace',
-            startupinfo=startupinfo
+            startupinfo=hidden_startupinfo(),
+            **(low_priority_kwargs() if low_priority else {})
         )
-        
-        stdout, stderr = process.communicate()
-        
+        if low_priority:
+            lower_priority(process)
+        if on_start:
+            on_start(process)
+        register_process(process)
+        tracer.count("subprocesses")
+
+        # stderr is drained on a side thread so neither pipe can fill up and block ffmpeg
+        log_tail = deque(maxlen=FFMPEG_LOG_LINES)
+        drain = threading.Thread(target=lambda: log_tail.extend(l.rstrip() for l in process.stderr), daemon=True)
+        drain.start()
+
+        started = time.monotonic()
+        last_frac, last_decile = 0.0, 0
+        for line in process.stdout:
+            key, _, value = line.strip().partition("=")
+            if key == "total_size" and value.isdigit():
+                trace.set(bytes_written=int(value))
+            # Newer builds emit out_time_us; out_time_ms is also microseconds despite its name
+            if key not in ("out_time_us", "out_time_ms") or not duration or not progress_callback:
+                continue
+            try:
+                frac = min(1.0, max(0.0, int(value) / 1e6 / duration))
+            except ValueError:
+                continue  # "N/A" before the first frame
+            if frac - last_frac >= 0.005:
+                last_frac = frac
+                progress_callback(frac)
+            decile = int(frac * 10)
+            if last_decile < decile < 10:
+                last_decile = decile
+                elapsed = time.monotonic() - started
+                log_callback(f"⏳ {frac:.0%} — ETA {_fmt_eta(elapsed * (1 - frac) / frac)}")
+
+        process.wait()
+        drain.join()
+        trace.set(returncode=process.returncode)
+
         if process.returncode == 0:
+            if progress_callback:
+                progress_callback(1.0)
             log_callback("✅ Operation Successful!")
             return True
+        elif current_task() is not None and current_task().cancelled:
+            log_callback("🛑 FFmpeg stopped")
+            return False
         else:
             # عرض جزء من الخطأ للمستخدم
-            err_msg = stderr[-200:] if stderr else "Unknown Error"
+            err_msg = "\n".join(list(log_tail)[-5:]) or "Unknown Error"
             log_callback(f"❌ FFmpeg Failed:\n{err_msg}")
             return False
 
@@ -91,4 +257,4 @@ def run_ffmpeg_command(cmd, log_callback):
         return False
     except Exception as e:
         log_callback(f"❌ Error: {str(e)}")
-        return False
\ No newline at end of file
+        return False
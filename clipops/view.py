@@ -2,8 +2,9 @@
 
 import customtkinter as ctk
 import os
-from tkinter import filedialog, messagebox
-from .config import APP_NAME, APP_VERSION, COMPANY_NAME, ACCENT_COLOR, ICON_FILE
+from tkinter import filedialog, messagebox, PhotoImage
+from .config import APP_NAME, APP_VERSION, COMPANY_NAME, ACCENT_COLOR, ICON_FILE, SUBTITLE_FORMATS, PREVIEW_THUMB_SIZE
+from .utils import seconds_to_vtt_fmt
 
 class ClipOpsView(ctk.CTk):
     """
@@ -116,7 +117,11 @@ class ClipOpsView(ctk.CTk):
         self.btn_translate = ctk.CTkButton(inner, text="Translate 🌍", width=150, fg_color="#009688")
         self.btn_translate.pack(side="left", padx=10)
         
-        self.btn_vtt = ctk.CTkButton(inner, text="Convert to VTT 📜", width=150, fg_color="#E91E63")
+        self.combo_sub_format = ctk.CTkComboBox(inner, values=SUBTITLE_FORMATS + ["all"], width=80)
+        self.combo_sub_format.pack(side="left", padx=(10, 0))
+        self.combo_sub_format.set("vtt")
+
+        self.btn_vtt = ctk.CTkButton(inner, text="Export Subtitles 📜", width=150, fg_color="#E91E63")
         self.btn_vtt.pack(side="left", padx=10)
 
     def _setup_topic_tab(self):
@@ -127,6 +132,8 @@ class ClipOpsView(ctk.CTk):
         
         ctk.CTkButton(tb, text="Paste", width=60, command=self._paste_clipboard).pack(side="right", padx=5)
         ctk.CTkButton(tb, text="Clear", width=60, fg_color="#444", command=lambda: self.txt_topics.delete("0.0", "end")).pack(side="right", padx=5)
+        self.btn_detect_topics = ctk.CTkButton(tb, text="Auto Detect 🧭", width=110, fg_color="#7E57C2")
+        self.btn_detect_topics.pack(side="left", padx=5)
         
         self.txt_topics = ctk.CTkTextbox(f, height=120, font=("Consolas", 12))
         self.txt_topics.pack(fill="both", expand=True, padx=5, pady=5)
@@ -137,6 +144,7 @@ class ClipOpsView(ctk.CTk):
 
     def _setup_manual_tab(self):
         f = self.tab_manual
+        self._create_timeline(f)
         cbox = ctk.CTkFrame(f, fg_color="transparent")
         cbox.pack(expand=True)
         rt = ctk.CTkFrame(cbox, fg_color="transparent")
@@ -149,10 +157,50 @@ class ClipOpsView(ctk.CTk):
         self.btn_manual_cut = ctk.CTkButton(cbox, text="Export Clip", width=150, fg_color="#607D8B")
         self.btn_manual_cut.pack(pady=20)
 
+    def _create_timeline(self, parent):
+        box = ctk.CTkFrame(parent, fg_color="transparent")
+        box.pack(fill="x", padx=10, pady=(10, 0))
+
+        tb = ctk.CTkFrame(box, fg_color="transparent")
+        tb.pack(fill="x")
+        self.btn_build_preview = ctk.CTkButton(tb, text="Build Preview 🎞️", width=130, fg_color="#7E57C2")
+        self.btn_build_preview.pack(side="left", padx=5)
+        ctk.CTkLabel(tb, text="Snap:").pack(side="left", padx=(15, 5))
+        self.combo_snap = ctk.CTkComboBox(tb, values=["off", "keyframe", "silence"], width=100)
+        self.combo_snap.pack(side="left")
+        self.combo_snap.set("keyframe")
+        self.lbl_timeline = ctk.CTkLabel(tb, text="No preview", font=("Consolas", 11), text_color="gray")
+        self.lbl_timeline.pack(side="right", padx=5)
+
+        # Thumbnail under the cursor + waveform timeline (drag to select a cut)
+        row = ctk.CTkFrame(box, fg_color="transparent")
+        row.pack(fill="x", pady=5)
+        w, h = PREVIEW_THUMB_SIZE
+        self.canvas_thumb = ctk.CTkCanvas(row, width=w, height=h, bg="#111111", highlightthickness=0)
+        self.canvas_thumb.pack(side="left", padx=(5, 10))
+        self.canvas_timeline = ctk.CTkCanvas(row, height=h, bg="#1e1e1e", highlightthickness=0, cursor="crosshair")
+        self.canvas_timeline.pack(side="left", fill="x", expand=True, padx=5)
+
+        c = self.canvas_timeline
+        c.bind("<Configure>", lambda e: self._draw_timeline())
+        c.bind("<Motion>", self._on_timeline_hover)
+        c.bind("<ButtonPress-1>", self._on_timeline_press)
+        c.bind("<B1-Motion>", self._on_timeline_drag)
+        c.bind("<ButtonRelease-1>", self._on_timeline_release)
+        self._preview = None
+        self._sprite = None
+        self._selection = None
+
     def _create_logs(self):
         self.log_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.log_frame.grid(row=3, column=0, padx=25, pady=(10, 25), sticky="nsew")
         
+        ctk.CTkLabel(self.log_frame, text="TASKS", font=("Roboto", 10, "bold"), text_color="gray").pack(anchor="w", padx=5)
+        self.frame_tasks = ctk.CTkScrollableFrame(self.log_frame, height=70, corner_radius=8)
+        self.frame_tasks.pack(fill="x", pady=(0, 10))
+        self.frame_tasks.grid_columnconfigure(0, weight=1)
+        self._task_rows = {}
+
         ctk.CTkLabel(self.log_frame, text="SYSTEM LOGS", font=("Roboto", 10, "bold"), text_color="gray").pack(anchor="w", padx=5)
         self.textbox_log = ctk.CTkTextbox(self.log_frame, corner_radius=8, font=("Consolas", 12))
         self.textbox_log.pack(fill="both", expand=True, pady=(0, 10))
@@ -180,13 +228,110 @@ class ClipOpsView(ctk.CTk):
             self.txt_topics.insert("0.0", self.clipboard_get())
         except: pass
 
+    # --- Timeline ---
+    def _timeline_time(self, x):
+        width = max(1, self.canvas_timeline.winfo_width())
+        return min(self._preview.duration, max(0.0, x / width * self._preview.duration))
+
+    def _timeline_x(self, t):
+        return t / self._preview.duration * self.canvas_timeline.winfo_width()
+
+    def _snapped(self, x):
+        return self._preview.snap(self._timeline_time(x), self.combo_snap.get())
+
+    def _draw_timeline(self):
+        c = self.canvas_timeline
+        c.delete("all")
+        if not self._preview:
+            return
+        width, height = c.winfo_width(), c.winfo_height()
+        mid = height / 2
+        # The whole waveform is one polygon: upper edge left to right, lower edge back
+        env = self._preview.envelope(width)
+        points = [v for x, e in enumerate(env) for v in (x, mid - e * mid)]
+        points += [v for x in range(width - 1, -1, -1) for v in (x, mid + env[x] * mid)]
+        if len(points) >= 6:
+            c.create_polygon(points, fill="#4FC3F7", outline="")
+        if len(self._preview.keyframes) < width / 3:  # Ticks only while they stay readable
+            for k in self._preview.keyframes:
+                x = self._timeline_x(k)
+                c.create_line(x, height - 6, x, height, fill="gray")
+        self._draw_selection()
+
+    def _draw_selection(self):
+        c = self.canvas_timeline
+        c.delete("sel")
+        if self._selection:
+            x0, x1 = sorted(self._timeline_x(t) for t in self._selection)
+            c.create_rectangle(x0, 1, x1, c.winfo_height() - 1, outline=ACCENT_COLOR, width=2, tags="sel")
+
+    def _on_timeline_hover(self, event):
+        if not self._preview:
+            return
+        t = self._timeline_time(event.x)
+        self.lbl_timeline.configure(text=seconds_to_vtt_fmt(t))
+        c = self.canvas_timeline
+        c.delete("cursor")
+        c.create_line(event.x, 0, event.x, c.winfo_height(), fill="white", tags="cursor")
+        if self._sprite:
+            # The tile is shown by offsetting the whole sprite; the canvas clips the rest
+            x, y, _, _ = self._preview.thumb_box(t)
+            self.canvas_thumb.delete("all")
+            self.canvas_thumb.create_image(-x, -y, anchor="nw", image=self._sprite)
+
+    def _on_timeline_press(self, event):
+        if self._preview:
+            t = self._snapped(event.x)
+            self._selection = [t, t]
+            self._draw_selection()
+
+    def _on_timeline_drag(self, event):
+        self._on_timeline_hover(event)
+        if self._preview and self._selection:
+            self._selection[1] = self._snapped(event.x)
+            self._draw_selection()
+
+    def _on_timeline_release(self, event):
+        if not self._preview or not self._selection:
+            return
+        start, end = sorted(self._selection)
+        if end > start:
+            self.set_manual_times(start, end)
+
     # --- Public API for Controller ---
     def log_message(self, msg):
+        self.log_messages([msg])
+
+    def log_messages(self, msgs):
+        # One insert per batch keeps the text widget cheap under heavy logging
         self.textbox_log.configure(state="normal")
-        self.textbox_log.insert("end", f"> {msg}\n")
+        self.textbox_log.insert("end", "".join(f"> {m}\n" for m in msgs))
         self.textbox_log.see("end")
         self.textbox_log.configure(state="disabled")
 
+    def update_tasks(self, tasks, on_cancel):
+        """Syncs the task list with TaskManager.snapshot() output."""
+        live = {t["id"] for t in tasks}
+        for task_id in list(self._task_rows):
+            if task_id not in live:
+                for w in self._task_rows.pop(task_id):
+                    w.destroy()
+
+        for row, t in enumerate(sorted(tasks, key=lambda t: -t["id"])):
+            if t["id"] not in self._task_rows:
+                label = ctk.CTkLabel(self.frame_tasks, anchor="w", font=("Consolas", 11))
+                button = ctk.CTkButton(self.frame_tasks, text="Cancel", width=60, height=20, fg_color="#B71C1C",
+                                       command=lambda i=t["id"]: on_cancel(i))
+                self._task_rows[t["id"]] = (label, button)
+            label, button = self._task_rows[t["id"]]
+            label.grid(row=row, column=0, sticky="ew", padx=5)
+            button.grid(row=row, column=1, padx=5, pady=1)
+
+            pct = f"{t['progress']:4.0%}" if t["progress"] is not None else "  … "
+            m, s = divmod(int(t["elapsed"]), 60)
+            label.configure(text=f"#{t['id']:<3} {t['name']:<22} {t['state']:<10} {pct}  {m:02d}:{s:02d}")
+            button.configure(state="normal" if t["state"] in ("queued", "running") else "disabled")
+
     def set_loading(self, is_loading, determinate=False, message="Processing..."):
         self.lbl_status.configure(text=message)
         if is_loading:
@@ -221,5 +366,24 @@ class ClipOpsView(ctk.CTk):
         self.entry_text.insert(0, path)
 
     def get_lang(self): return self.combo_lang.get()
+    def get_sub_formats(self):
+        fmt = self.combo_sub_format.get()
+        return list(SUBTITLE_FORMATS) if fmt == "all" else [fmt]
     def get_topics_text(self): return self.txt_topics.get("0.0", "end")
-    def get_manual_times(self): return self.entry_man_start.get(), self.entry_man_end.get()
\ No newline at end of file
+    def set_topics_text(self, text):
+        self.txt_topics.delete("0.0", "end")
+        self.txt_topics.insert("0.0", text)
+    def get_manual_times(self): return self.entry_man_start.get(), self.entry_man_end.get()
+    def set_manual_times(self, start, end):
+        for entry, t in ((self.entry_man_start, start), (self.entry_man_end, end)):
+            entry.delete(0, "end")
+            entry.insert(0, seconds_to_vtt_fmt(t))
+
+    def set_preview(self, preview):
+        """Shows a preview.Preview on the timeline (None clears it)."""
+        self._preview = preview
+        self._selection = None
+        self._sprite = PhotoImage(file=preview.sprite) if preview and os.path.exists(preview.sprite) else None
+        self.canvas_thumb.delete("all")
+        self.lbl_timeline.configure(text=seconds_to_vtt_fmt(preview.duration) if preview else "No preview")
+        self._draw_timeline()
\ No newline at end of file
@@ -0,0 +1,238 @@
+# clipops/watcher.py
+
+"""
+Watch-folder ingestion: python -m clipops watch FOLDER --ops transcribe,whatsapp,translate
+
+The folder is polled with os.scandir (stdlib only, works the same on local
+disks and network shares, where inotify events are unreliable anyway). A new
+video is processed once its size and mtime have not changed for
+WATCH_STABLE_SECONDS, and only if its content fingerprint has not been
+processed before, so a re-uploaded or renamed copy is skipped. Files run
+through the batch JobQueue on a bounded pool; counts, queue depth and
+throughput are written to a status JSON file after every scan and job.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .batch import JobQueue, VIDEO_EXTENSIONS, add_job_arguments, parse_ops, job_options
+from .config import WATCH_INTERVAL, WATCH_STABLE_SECONDS, WATCH_STATUS_FILE, WATCH_SEEN_FILE
+from .utils import file_fingerprint
+
+
+def _iso(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(ts))
+
+
+class FolderWatcher:
+    """Polls one folder (not its sub-folders, where outputs are written) and runs `ops` on each new video."""
+
+    def __init__(self, folder, ops, options=None, queue=None, jobs=1, interval=WATCH_INTERVAL,
+                 stable_seconds=WATCH_STABLE_SECONDS, status_path=None, log=print):
+        self.folder = os.path.abspath(folder)
+        self.ops = list(ops)
+        self.options = options or {}
+        self.jobs = max(1, jobs)
+        self.interval = interval
+        self.stable_seconds = stable_seconds
+        self.status_path = status_path or os.path.join(self.folder, WATCH_STATUS_FILE)
+        self.seen_path = os.path.join(self.folder, WATCH_SEEN_FILE)
+        self.queue = queue or JobQueue(concurrency=self.jobs, log=log)
+        self.log = log
+
+        self._files = {}  # path -> ((size, mtime_ns), stable since | None once submitted)
+        self._lock = threading.Lock()
+        self._seen = self._load_seen()  # content hash -> path (processed or in flight)
+        self._queued = self._running = self._processed = self._failed = self._duplicates = 0
+        self._recent = deque(maxlen=20)
+        self._started = time.time()
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="clipops-watch")
+
+    # --- Seen hashes ---
+    def _load_seen(self):
+        last = {}
+        if os.path.exists(self.seen_path):
+            with open(self.seen_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # Half-written line from a killed run
+                    last[rec.get("hash")] = (rec.get("file"), rec.get("status"))
+        # Failed files are retried when they show up again
+        return {h: path for h, (path, status) in last.items() if status == "done"}
+
+    def _append_seen(self, digest, path, status):
+        with self._lock:
+            with open(self.seen_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"hash": digest, "file": path, "status": status, "ts": round(time.time(), 3)},
+                                   ensure_ascii=False) + "\n")
+
+    # --- Scanning ---
+    def scan(self, now=None):
+        """One poll. Returns the files submitted for processing."""
+        now = time.monotonic() if now is None else now
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError as e:
+            self.log(f"⚠️ Cannot read {self.folder}: {e}")
+            return []
+
+        present, ready = set(), []
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue  # Removed between scandir and stat
+            present.add(entry.path)
+            signature = (st.st_size, st.st_mtime_ns)
+            known = self._files.get(entry.path)
+            if known is None or known[0] != signature:
+                self._files[entry.path] = (signature, now)  # New, or still being written
+            elif known[1] is not None and st.st_size and now - known[1] >= self.stable_seconds:
+                self._files[entry.path] = (signature, None)
+                ready.append(entry.path)
+
+        for path in set(self._files) - present:
+            del self._files[path]  # Deleted or moved away
+        return [path for path in ready if self._submit(path)]
+
+    def _submit(self, path):
+        name = os.path.basename(path)
+        try:
+            digest = file_fingerprint(path)["hash"]
+        except OSError:
+            return False
+        with self._lock:
+            original = self._seen.get(digest)
+            if original is None:
+                self._seen[digest] = path
+                self._queued += 1
+            elif original != path:
+                self._duplicates += 1
+        if original == path:
+            return False  # Processed before a restart; not a duplicate
+        if original is not None:
+            self.log(f"♻️ {name}: same content as {os.path.basename(original)}, skipped")
+            return False
+
+        # New content under a path processed before (file replaced): run its operations again
+        self.queue.done.difference_update((path, op) for op in self.ops)
+        self.log(f"📥 {name}: queued ({', '.join(self.ops)})")
+        self._pool.submit(self._process, path, digest)
+        return True
+
+    def _process(self, path, digest):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        t0 = time.perf_counter()
+        try:
+            failures = self.queue.run_file(path, self.ops, self.options)
+        except Exception as e:
+            self.log(f"❌ {os.path.basename(path)}: {e}")
+            failures = 1
+        status = "failed" if failures else "done"
+
+        with self._lock:
+            self._running -= 1
+            if failures:
+                self._failed += 1
+                self._seen.pop(digest, None)
+            else:
+                self._processed += 1
+            self._recent.append({"file": path, "status": status, "seconds": round(time.perf_counter() - t0, 3),
+                                 "finished": _iso(time.time())})
+        self._append_seen(digest, path, status)
+        self.write_status()
+
+    # --- Status ---
+    def status(self):
+        with self._lock:
+            now = time.time()
+            uptime = now - self._started
+            return {
+                "folder": self.folder, "ops": self.ops, "workers": self.jobs,
+                "started": _iso(self._started), "updated": _iso(now), "uptime_seconds": round(uptime, 1),
+                "waiting_for_stable": sum(1 for _, since in self._files.values() if since is not None),
+                "queue_depth": self._queued, "running": self._running,
+                "processed": self._processed, "failed": self._failed, "duplicates": self._duplicates,
+                "throughput_per_hour": round(self._processed / uptime * 3600, 2) if uptime > 0 else 0.0,
+                "recent": list(self._recent),
+            }
+
+    def write_status(self):
+        status = self.status()
+        tmp = f"{self.status_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(status, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.status_path)
+        except OSError as e:
+            self.log(f"⚠️ Cannot write status file: {e}")
+
+    # --- Loop ---
+    def run(self):
+        """Scans until stop() (or Ctrl+C); running jobs finish, queued ones are dropped and retried next start."""
+        self.log(f"👀 Watching {self.folder} every {self.interval:g}s "
+                 f"(stable after {self.stable_seconds:g}s), {self.jobs} at a time: {', '.join(self.ops)}")
+        try:
+            while not self._stop.is_set():
+                self.scan()
+                self.write_status()
+                self._stop.wait(self.interval)
+        finally:
+            with self._lock:
+                running = self._running
+            if running:
+                self.log(f"🛑 Stopping: waiting for {running} running job(s)...")
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            with self._lock:
+                self._queued = 0
+            self.write_status()
+
+    def stop(self):
+        self._stop.set()
+
+
+# --- CLI ---
+def build_parser():
+    p = argparse.ArgumentParser(prog="python -m clipops watch",
+                                description="Watches a folder and runs operations on every new video.")
+    p.add_argument("folder", help="Folder recorders drop files into")
+    add_job_arguments(p)
+    p.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="Seconds between scans")
+    p.add_argument("--stable", type=float, default=WATCH_STABLE_SECONDS,
+                   help="Seconds a file's size and mtime must stay unchanged before it is processed")
+    p.add_argument("--status", help=f"Status JSON file (default: <folder>/{WATCH_STATUS_FILE})")
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    ops = parse_ops(args.ops)
+    if ops is None:
+        return 2
+    if not os.path.isdir(args.folder):
+        print(f"❌ Not a folder: {args.folder}", file=sys.stderr)
+        return 2
+
+    queue = JobQueue(args.manifest, concurrency=args.jobs)
+    watcher = FolderWatcher(args.folder, ops, job_options(args), queue=queue, jobs=args.jobs,
+                            interval=args.interval, stable_seconds=args.stable, status_path=args.status)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    print(f"🏁 Stopped. Status: {watcher.status_path}")
+    return 0
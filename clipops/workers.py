@@ -0,0 +1,87 @@
+# clipops/workers.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .config import FFMPEG_COPY_WORKERS, FFMPEG_ENCODE_WORKERS
+from .utils import run_ffmpeg_command, parse_timestamp
+from .tasks import current_task, task_context
+
+_CODEC_FLAGS = ("-c", "-codec", "-c:v", "-c:a", "-codec:v", "-codec:a", "-vcodec", "-acodec")
+
+
+def job_kind(cmd):
+    """'copy' when every codec option is a stream copy, otherwise 'encode'."""
+    codecs = [cmd[i + 1] for i, arg in enumerate(cmd[:-1]) if arg in _CODEC_FLAGS]
+    return "copy" if codecs and all(c == "copy" for c in codecs) else "encode"
+
+
+class FFmpegPool:
+    """
+    Runs independent ffmpeg jobs concurrently.
+    Stream-copy (I/O-bound) and re-encode (CPU-bound) jobs have separate limits that
+    are shared process-wide, so parallel callers (e.g. batch runs) cannot oversubscribe.
+    The first failure cancels queued jobs and kills the ones still running.
+    """
+
+    def __init__(self, copy_workers=FFMPEG_COPY_WORKERS, encode_workers=FFMPEG_ENCODE_WORKERS):
+        self.limits = {"copy": copy_workers, "encode": encode_workers}
+        self._slots = {kind: threading.BoundedSemaphore(n) for kind, n in self.limits.items()}
+
+    def run(self, commands, log_callback, fail_fast=True, progress_callback=None):
+        """Runs every command; returns a list of booleans in the same order as `commands`."""
+        if not commands:
+            return []
+
+        # Overall progress is the duration-weighted mean of each job's progress
+        weights = [parse_timestamp(dict(zip(c, c[1:])).get("-t", 1)) or 1 for c in commands]
+        total = sum(weights)
+        fractions = [0.0] * len(commands)
+
+        def job_progress(index):
+            if not progress_callback:
+                return None
+
+            def report(frac):
+                fractions[index] = frac
+                progress_callback(sum(f * w for f, w in zip(fractions, weights)) / total)
+            return report
+
+        owner = current_task()  # Pool threads act on behalf of the calling task
+        cancelled = threading.Event()
+        running = set()
+        lock = threading.Lock()
+
+        def track(process):
+            with lock:
+                running.add(process)
+                if cancelled.is_set():
+                    process.kill()
+
+        def job(index, cmd):
+            slot = self._slots[job_kind(cmd)]
+            with slot, task_context(owner):
+                if cancelled.is_set() or (owner is not None and owner.cancelled):
+                    return False
+                ok = run_ffmpeg_command(cmd, log_callback, on_start=track, progress_callback=job_progress(index),
+                                        duration=weights[index] if "-t" in cmd else None)
+            if not ok and fail_fast and not cancelled.is_set():
+                cancelled.set()
+                with lock:
+                    for p in running:
+                        if p.poll() is None:
+                            p.kill()
+            return ok
+
+        workers = min(len(commands), sum(self.limits.values()))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clipops-ffmpeg") as pool:
+            results = list(pool.map(job, range(len(commands)), commands))
+
+        if cancelled.is_set():
+            skipped = results.count(False) - 1
+            if skipped > 0:
+                log_callback(f"🛑 Cancelled {skipped} remaining job(s) after a failure.")
+        return results
+
+
+# Shared so concurrent operations respect the same limits
+ffmpeg_pool = FFmpegPool()
@@ -1,11 +1,22 @@
 # main.py
 
+import time
+_T0 = time.perf_counter()
+
+import argparse
 import ctypes
+import multiprocessing
 from clipops.config import APP_NAME, APP_VERSION, ICON_FILE
+from clipops.startup import StartupTimer, import_breakdown
 from clipops.utils import ensure_icon_exists
-from clipops.controller import ClipOpsController
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"{APP_NAME} {APP_VERSION}")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print start-up phase timings and the slowest imports")
+    args = parser.parse_args(argv)
+    timer = StartupTimer(_T0)
+
     # 1. Fix Taskbar Icon for Windows
     try:
         myappid = f'collexa.{APP_NAME}.{APP_VERSION}.gui'
@@ -16,9 +27,23 @@ def main():
     # 2. Ensure resources exist
     ensure_icon_exists(ICON_FILE)
 
-    # 3. Launch App using MVC
+    # 3. Launch App using MVC (GUI imports happen here, after argument parsing)
+    from clipops.controller import ClipOpsController
+    timer.mark("imports")
     app = ClipOpsController()
-    app.run()
+    timer.mark("window built")
+
+    def on_ready():
+        timer.mark("first idle")
+        if args.startup_report:
+            print("\n".join(["⏱️ Start-up phases:"] + timer.report()))
+            print("⏱️ Slowest imports (cumulative / self, fresh interpreter):")
+            for cumulative, own, name in import_breakdown():
+                print(f"{cumulative:8.1f} ms {own:8.1f} ms  {name}")
+
+    app.run(on_ready=on_ready)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Required for the transcription worker processes in the frozen .exe
+    multiprocessing.freeze_support()
+    main()